@@ -1,5 +1,26 @@
 import hashlib
+import heapq
+import mmap
+import multiprocessing
 import os
+import struct
+import tempfile
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+SHARD_BYTES = 64 * 1024 * 1024
+READ_CHUNK_BYTES = 4 * 1024 * 1024
+CANCEL_CHECK_LINES = 1 << 16
+# Everything str.strip() removes from an ASCII line, so bytes and text mode agree
+_ASCII_WHITESPACE = b' \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f'
+
+# Digest index file: header, then sorted (digest, line offset, line number) records
+INDEX_MAGIC = b'PWIDX\x00\x00\x02'
+INDEX_RUN_RECORDS = 1 << 20
+_INDEX_HEADER = struct.Struct('>8sHQQQ20s')  # magic, digest size, wordlist size, mtime_ns, records, content sha1
+_INDEX_RECORD_TAIL = struct.Struct('>QQ')
+
+_found_shard = None
 
 def sha1_hash(data: str) -> str:
     return hashlib.sha1(data.encode('utf-8')).hexdigest()
@@ -35,6 +56,347 @@ def find_plaintext(file_path, hash_to_crack):
                 return word, attempts
     return None, attempts
 
+def crack_batch(password_list_path, target_hashes, salted_targets=()):
+    """Crack many plain and salted SHA-1 hashes in a single pass over the wordlist.
+
+    `target_hashes` is an iterable of hex digests, `salted_targets` an iterable of
+    (salt, hex digest) pairs. Returns a dict mapping each hash (or (salt, hash) pair)
+    to (password, attempts); attempts is the same line count crack_sha1 and
+    crack_sha1_with_salt would report for that target alone.
+    """
+    pending = set(target_hashes)
+    pending_salted = defaultdict(set)
+    for salt, target_hash in salted_targets:
+        pending_salted[salt].add(target_hash)
+    remaining = len(pending) + sum(len(hashes) for hashes in pending_salted.values())
+    results = {}
+    attempts = 0
+    with open(password_list_path, 'r', encoding='utf-8', errors='ignore') as file:
+        for line in file:
+            if not remaining:
+                break
+            password = line.strip()
+            attempts += 1
+            if pending:
+                digest = sha1_hash(password)
+                if digest in pending:
+                    pending.discard(digest)
+                    results[digest] = (password, attempts)
+                    remaining -= 1
+            for salt, hashes in pending_salted.items():
+                if not hashes:
+                    continue
+                digest = sha1_hash(salt + password)
+                if digest in hashes:
+                    hashes.discard(digest)
+                    results[(salt, digest)] = (password, attempts)
+                    remaining -= 1
+    for target_hash in pending:
+        results[target_hash] = (None, attempts)
+    for salt, hashes in pending_salted.items():
+        for target_hash in hashes:
+            results[(salt, target_hash)] = (None, attempts)
+    return results
+
+def _candidate(line: bytes) -> bytes:
+    """Bytes equivalent of reading `line` in text mode and calling strip()."""
+    if line.isascii():
+        return line.strip(_ASCII_WHITESPACE)
+    return line.decode('utf-8', errors='ignore').strip().encode('utf-8')
+
+def _is_clean(data: bytes) -> bool:
+    """True when no line in `data` needs stripping beyond its b'\\n' separator."""
+    return data.isascii() and not any(c in data for c in _ASCII_WHITESPACE if c != 0x0a)
+
+def _scan_lines(lines, state, target_digest, suffix=None, clean=False):
+    """Return the index of the first raw line whose digest equals `target_digest`, or -1.
+
+    Each candidate is hashed on a copy() of `state`, which already holds any prefix
+    salt; with `suffix` the candidate is hashed as password + suffix instead.
+    `clean` lines (see _is_clean) are hashed as-is without per-line stripping.
+    """
+    copy = state.copy
+    if clean and suffix is None:
+        for i, password in enumerate(lines):
+            h = copy()
+            h.update(password)
+            if h.digest() == target_digest:
+                return i
+        return -1
+    for i, line in enumerate(lines):
+        if clean:
+            password = line
+        elif line.isascii():
+            password = line.strip(_ASCII_WHITESPACE)
+        else:
+            password = _candidate(line)
+        h = copy()
+        h.update(password if suffix is None else password + suffix)
+        if h.digest() == target_digest:
+            return i
+    return -1
+
+def _iter_line_chunks(path, chunk_size=READ_CHUNK_BYTES):
+    """Yield (raw lines, clean) per large binary chunk of the file."""
+    with open(path, 'rb') as file:
+        rest = b''
+        while block := file.read(chunk_size):
+            data = rest + block
+            cut = data.rfind(b'\n') + 1
+            rest = data[cut:]
+            if cut:
+                head = data[:cut - 1]
+                yield head.split(b'\n'), _is_clean(head)
+        if rest:
+            yield [rest], _is_clean(rest)
+
+def crack_sha1_with_salt_bytes(file_path, target_hash, salt, suffix=False, chunk_size=READ_CHUNK_BYTES):
+    """Bytes-native crack_sha1_with_salt; same (password, attempts) result.
+
+    A prefix salt is absorbed into a SHA-1 state once and the state is copied per
+    candidate; `suffix=True` hashes password + salt instead. Raw 20-byte digests are
+    compared and the wordlist is read in `chunk_size` binary blocks.
+    """
+    salt = salt.encode('utf-8') if isinstance(salt, str) else salt
+    target_digest = bytes.fromhex(target_hash)
+    state = hashlib.sha1() if suffix else hashlib.sha1(salt)
+    attempts = 0
+    for lines, clean in _iter_line_chunks(file_path, chunk_size):
+        hit = _scan_lines(lines, state, target_digest, salt if suffix else None, clean)
+        if hit >= 0:
+            return _candidate(lines[hit]).decode('utf-8'), attempts + hit + 1
+        attempts += len(lines)
+    return None, attempts
+
+def _shard_offsets(mm, shards):
+    """Split the mapped wordlist into (start, end) byte ranges that end on a newline."""
+    size = len(mm)
+    bounds = [0]
+    for k in range(1, shards):
+        if bounds[-1] >= size:
+            break
+        pos = mm.find(b'\n', max(size * k // shards, bounds[-1]))
+        if pos == -1:
+            break
+        if pos + 1 > bounds[-1]:
+            bounds.append(pos + 1)
+    if bounds[-1] < size:
+        bounds.append(size)
+    return list(zip(bounds, bounds[1:]))
+
+def _init_shard_worker(found_shard):
+    global _found_shard
+    _found_shard = found_shard
+
+def _crack_shard(path, index, start, end, target_digest, salt):
+    """Hash one shard; returns (index, password or None, lines read)."""
+    with open(path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        data = mm[start:end]
+    clean = _is_clean(data)
+    lines = data.split(b'\n')
+    del data
+    if lines[-1] == b'':
+        lines.pop()
+    state = hashlib.sha1(salt.encode('utf-8'))
+    for base in range(0, len(lines), CANCEL_CHECK_LINES):
+        # Stop early once a shard in front of this one has a hit
+        if base and _found_shard.value < index:
+            return index, None, base
+        hit = _scan_lines(lines[base:base + CANCEL_CHECK_LINES], state, target_digest, clean=clean)
+        if hit >= 0:
+            return index, _candidate(lines[base + hit]).decode('utf-8'), base + hit + 1
+    return index, None, len(lines)
+
+def _crack_parallel(path, target_hash, salt, processes):
+    processes = processes or os.cpu_count() or 1
+    with open(path, 'rb') as file:
+        size = os.fstat(file.fileno()).st_size
+        if size == 0:
+            return None, 0
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            shards = _shard_offsets(mm, max(processes * 4, -(-size // SHARD_BYTES)))
+
+    target_digest = bytes.fromhex(target_hash)
+    found_shard = multiprocessing.Value('q', len(shards))
+    results = {}
+    best = None
+    with ProcessPoolExecutor(processes, initializer=_init_shard_worker, initargs=(found_shard,)) as pool:
+        futures = {
+            pool.submit(_crack_shard, path, index, start, end, target_digest, salt): index
+            for index, (start, end) in enumerate(shards)
+        }
+        for future in as_completed(futures):
+            if future.cancelled():
+                continue
+            index, password, count = future.result()
+            results[index] = (password, count)
+            if password is not None and (best is None or index < best):
+                best = index
+                found_shard.value = index
+                for other, other_index in futures.items():
+                    if other_index > best:
+                        other.cancel()
+            # A hit is final once every shard in front of it finished without one
+            if best is not None and all(i in results for i in range(best)):
+                break
+
+    if best is None:
+        return None, sum(count for _, count in results.values())
+    attempts = sum(results[i][1] for i in range(best)) + results[best][1]
+    return results[best][0], attempts
+
+def crack_sha1_parallel(target_hash, password_list_path, processes=None):
+    """crack_sha1 / find_plaintext spread over a process pool; same (password, attempts) result.
+
+    Lines are split on b'\\n' only, so a bare '\\r' is not treated as a line break.
+    """
+    return _crack_parallel(password_list_path, target_hash, '', processes)
+
+def crack_sha1_with_salt_parallel(file_path, target_hash, salt, processes=None):
+    """crack_sha1_with_salt spread over a process pool; same (password, attempts) result."""
+    return _crack_parallel(file_path, target_hash, salt, processes)
+
+def index_path(password_list_path, algorithm='sha1'):
+    return f"{password_list_path}.{algorithm}.idx"
+
+def _read_index_header(path):
+    try:
+        with open(path, 'rb') as file:
+            fields = _INDEX_HEADER.unpack(file.read(_INDEX_HEADER.size))
+    except (OSError, struct.error):
+        return None
+    return fields if fields[0] == INDEX_MAGIC else None
+
+def _hash_content(mm, start, end, hasher=None):
+    """Stream mm[start:end] into a SHA-1 object (a fresh one unless `hasher` is given)."""
+    hasher = hasher or hashlib.sha1()
+    for pos in range(start, end, SHARD_BYTES):
+        hasher.update(mm[pos:min(pos + SHARD_BYTES, end)])
+    return hasher
+
+def _iter_lines(mm, start=0):
+    """Yield (byte offset, raw line) for every line of the mapped wordlist from `start`."""
+    size = len(mm)
+    while start < size:
+        end = mm.find(b'\n', min(start + SHARD_BYTES, size))
+        end = size if end == -1 else end + 1
+        lines = mm[start:end].split(b'\n')
+        if lines[-1] == b'':
+            lines.pop()
+        for line in lines:
+            yield start, line
+            start += len(line) + 1
+        start = end
+
+def _iter_records(file, width, start):
+    file.seek(start)
+    while True:
+        block = file.read(width * 4096)
+        if not block:
+            return
+        for i in range(0, len(block), width):
+            yield block[i:i + width]
+
+def _write_run(records, directory):
+    records.sort()
+    with tempfile.NamedTemporaryFile('wb', dir=directory, delete=False) as run:
+        run.write(b''.join(records))
+    return run.name
+
+def build_index(password_list_path, algorithm='sha1'):
+    """Build or refresh the on-disk digest index of the wordlist; returns its path.
+
+    Nothing is rehashed while the wordlist's size and mtime match the header. If the
+    wordlist grew and the whole previously indexed prefix is unchanged (same SHA-1 of
+    its content, ending in a newline), only the appended lines are hashed and merged
+    in; any other change rebuilds the index. Records are
+    sorted in runs of INDEX_RUN_RECORDS and merged, so memory stays bounded.
+    """
+    idx_path = index_path(password_list_path, algorithm)
+    digest_size = hashlib.new(algorithm).digest_size
+    stat = os.stat(password_list_path)
+    header = _read_index_header(idx_path)
+    if header and header[1:4] == (digest_size, stat.st_size, stat.st_mtime_ns):
+        return idx_path
+
+    width = digest_size + _INDEX_RECORD_TAIL.size
+    directory = os.path.dirname(os.path.abspath(idx_path))
+    runs = []
+    with open(password_list_path, 'rb') as file:
+        mm = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if stat.st_size else b''
+        try:
+            start = lineno = 0
+            content = None
+            if (header and header[1] == digest_size and 0 < header[2] < stat.st_size
+                    and mm[header[2] - 1:header[2]] == b'\n'):
+                content = _hash_content(mm, 0, header[2])
+            if content is not None and content.digest() == header[5]:
+                start, lineno = header[2], header[4]
+            else:
+                header = None
+                content = _hash_content(mm, 0, 0)
+            batch = []
+            for offset, line in _iter_lines(mm, start):
+                lineno += 1
+                digest = hashlib.new(algorithm, _candidate(line)).digest()
+                batch.append(digest + _INDEX_RECORD_TAIL.pack(offset, lineno))
+                if len(batch) >= INDEX_RUN_RECORDS:
+                    runs.append(_write_run(batch, directory))
+                    batch = []
+            if batch:
+                runs.append(_write_run(batch, directory))
+            fingerprint = _hash_content(mm, start, stat.st_size, content).digest()
+        finally:
+            if stat.st_size:
+                mm.close()
+
+    sources = [open(run, 'rb') for run in runs]
+    streams = [_iter_records(source, width, 0) for source in sources]
+    if header:
+        sources.append(open(idx_path, 'rb'))
+        streams.append(_iter_records(sources[-1], width, _INDEX_HEADER.size))
+    try:
+        with tempfile.NamedTemporaryFile('wb', dir=directory, delete=False) as out:
+            out.write(_INDEX_HEADER.pack(INDEX_MAGIC, digest_size, stat.st_size,
+                                         stat.st_mtime_ns, lineno, fingerprint))
+            for record in heapq.merge(*streams):
+                out.write(record)
+        os.replace(out.name, idx_path)
+    finally:
+        for source in sources:
+            source.close()
+        for run in runs:
+            os.remove(run)
+    return idx_path
+
+def lookup_index(target_hash, password_list_path, algorithm='sha1'):
+    """Crack an unsalted hash by binary search over the digest index.
+
+    Returns the same (password, attempts) as crack_sha1: attempts is the line
+    number of the first matching line, or the total line count on a miss.
+    """
+    idx_path = build_index(password_list_path, algorithm)
+    target = bytes.fromhex(target_hash)
+    with open(idx_path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        _, digest_size, _, _, count, _ = _INDEX_HEADER.unpack_from(mm)
+        width = digest_size + _INDEX_RECORD_TAIL.size
+        lo, hi = 0, count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            pos = _INDEX_HEADER.size + mid * width
+            if mm[pos:pos + digest_size] < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        pos = _INDEX_HEADER.size + lo * width
+        if lo == count or mm[pos:pos + digest_size] != target:
+            return None, count
+        offset, lineno = _INDEX_RECORD_TAIL.unpack_from(mm, pos + digest_size)
+    with open(password_list_path, 'rb') as file:
+        file.seek(offset)
+        line = file.readline()
+    return _candidate(line).decode('utf-8'), lineno
+
 def main():
     password_list = os.path.join(os.path.dirname(__file__), '..', 'password.txt')
     targets = [
@@ -42,8 +404,13 @@ def main():
         {"name": "Medium hash", "hash": "9b467cbabe4b44ce7f34332acc1aa7305d4ac2ba"},
     ]
 
+    salt_hash = 'dfc3e4f0b9b5fb047e9be9fb89016f290d2abb06'
+    target_hash_leet = '9d6b628c1f81b4795c0266c0f12123c1e09a7ad3'
+    # One pass over the wordlist for every unsalted hash, including the salt itself
+    cracked = crack_batch(password_list, [target["hash"] for target in targets] + [salt_hash])
+
     for target in targets:
-        result, attempts = crack_sha1(target["hash"], password_list)
+        result, attempts = cracked[target["hash"]]
         if result:
             print(f"Hash: {target['hash']}")
             print(f"Password: {result}")
@@ -51,9 +418,7 @@ def main():
         else:
             print(f"{target['name']} not found. Attempts: {attempts}\n")
 
-    salt_hash = 'dfc3e4f0b9b5fb047e9be9fb89016f290d2abb06'
-    target_hash_leet = '9d6b628c1f81b4795c0266c0f12123c1e09a7ad3'
-    real_salt, salt_attempts = find_plaintext(password_list, salt_hash)
+    real_salt, salt_attempts = cracked[salt_hash]
 
     if real_salt:
         print(f"Salt found: {real_salt}")
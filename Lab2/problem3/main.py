@@ -6,8 +6,23 @@ Q3: 以學生證號作為種子，進行區塊鏈挖礦，每個區塊成功時
     3) [EROR] ...
 """
 
+import contextlib
 import hashlib
+import json
+import multiprocessing
+import os
 import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+MAX_NONCE = 0xffffffff
+NONCE_CHUNK = 1 << 18        # 每個工作單位的 nonce 數量
+CANCEL_CHECK = 1 << 14       # 每嘗試多少 nonce 檢查一次是否已被取消
+CHECKPOINT_NONCES = 1 << 24  # 每嘗試多少 nonce 寫一次 checkpoint
+
+_HEX_DIGITS = set('0123456789abcdef')
+_LOW_HEX = [b'%04x' % low for low in range(1 << 16)]  # nonce 低 16 位元的十六進位字串
+
+_found_chunk = None
 
 def sha256_hash(data: str) -> str:
     """回傳 data 的 SHA-256 雜湊值（16進位小寫）。"""
@@ -23,57 +38,258 @@ def mine_block(previous_hash: str, target_prefix: str):
     若計算出的區塊哈希 (previous_hash + nonce_hex) 符合 target_prefix 則回傳 (block_hash, nonce_hex)；
     否則回傳 (None, None)。
     """
-    nonce = 0
-    max_nonce = 0xffffffff
-    while nonce <= max_nonce:
-        nonce_hex = format(nonce, '08x')
-        candidate = previous_hash + nonce_hex
-        candidate_hash = sha256_hash(candidate)
-        if candidate_hash.startswith(target_prefix):
-            return candidate_hash, nonce_hex
-        nonce += 1
-    return None, None
+    return _mine_range(previous_hash, target_prefix, 0, MAX_NONCE + 1)
 
-if __name__ == "__main__":
-    # 1. 以學生證號作為種子 (範例：313553024)
-    student_id = "313553024"
-    preImage = sha256_hash(student_id)
-
-    # 2. 建立日誌暫存，並記錄 preImage
-    log_entries = []
-    log_entries.append(f"{get_current_time()} [INFO] [preImage] {preImage}")
-
-    # 3. 決定起始區塊：比較 preImage 與 student_id，第一個不相符的位置即為 starting_block
-    starting_block = 1
-    for i in range(min(len(student_id), len(preImage))):
-        if preImage[i] != student_id[i]:
-            starting_block = i + 1
-            break
+def _hex_target(target_prefix: str):
+    """
+    將十六進位前綴轉成 (完整位元組, 最後半個位元組或 None)，
+    以便直接比對 digest；若前綴含非小寫十六進位字元（永遠不可能符合）則回傳 None。
+    """
+    if not set(target_prefix) <= _HEX_DIGITS:
+        return None
+    even = len(target_prefix) // 2 * 2
+    nibble = int(target_prefix[even:], 16) if even < len(target_prefix) else None
+    return bytes.fromhex(target_prefix[:even]), nibble
 
-    # 4. 挖礦流程
-    previous_hash = preImage
-    total_rounds = 6  # 至少挖到學生證前7位
-    for round_num in range(starting_block, starting_block + total_rounds):
-        target_prefix = student_id[:round_num]
+def _mine_range(previous_hash: str, target_prefix: str, start: int, stop: int):
+    """
+    在 [start, stop) 區間內依序嘗試 nonce，
+    回傳第一個符合的 (block_hash, nonce_hex)；否則回傳 (None, None)。
+    previous_hash（64 字元，恰為一個 SHA-256 區塊）與 nonce 高 16 位元的十六進位
+    只吸收一次，每個 nonce 僅 copy() 狀態並補上低 4 個十六進位字元，
+    再以 digest 位元組比對前綴，結果與逐一 hexdigest().startswith() 相同。
+    """
+    target = _hex_target(target_prefix)
+    if target is None:
+        return None, None
+    prefix, nibble = target
+    n = len(prefix)
+    midstate = hashlib.sha256(previous_hash.encode())
+    nonce = start
+    while nonce < stop:
+        high = nonce >> 16
+        state = midstate.copy()
+        state.update(b'%04x' % high)
+        copy = state.copy
+        for low in range(nonce & 0xffff, min(0x10000, stop - (high << 16))):
+            h = copy()
+            h.update(_LOW_HEX[low])
+            digest = h.digest()
+            if digest.startswith(prefix) and (nibble is None or digest[n] >> 4 == nibble):
+                return digest.hex(), format((high << 16) | low, '08x')
+        nonce = (high + 1) << 16
+    return None, None
 
-        # 先檢查是否已經符合 (without nonce)
-        if previous_hash.startswith(target_prefix):
-            # 若符合，僅記錄一行成功訊息
-            log_entries.append(f"{get_current_time()} [INFO] [Round {round_num} without nonce] {previous_hash}")
-            continue
+def _init_miner(found_chunk):
+    global _found_chunk
+    _found_chunk = found_chunk
 
-        # 若不符合，則進行 with nonce 的挖礦嘗試
-        block_hash, nonce_hex = mine_block(previous_hash, target_prefix)
+def _mine_chunk(previous_hash: str, target_prefix: str, index: int, start: int, stop: int):
+    """
+    工作行程：挖第 index 個 nonce 區塊 [start, stop)，回傳 (index, block_hash, nonce_hex)。
+    若已有更前面的區塊找到解，提早放棄。
+    """
+    for sub in range(start, stop, CANCEL_CHECK):
+        if _found_chunk.value < index:
+            return index, None, None
+        block_hash, nonce_hex = _mine_range(previous_hash, target_prefix, sub, min(sub + CANCEL_CHECK, stop))
         if block_hash:
-            # 成功挖到符合條件的區塊 => 僅記錄一行
-            log_entries.append(f"{get_current_time()} [INFO] [Round {round_num} with nonce {nonce_hex}] {block_hash}")
-            previous_hash = block_hash
-        else:
-            # 未找到符合要求的區塊 => 僅記錄一行錯誤訊息
-            log_entries.append(f"{get_current_time()} [EROR] [Round {round_num}] not found with running out of nonce")
+            return index, block_hash, nonce_hex
+    return index, None, None
+
+class MinerPool(ProcessPoolExecutor):
+    """
+    挖礦用工作行程池，附帶各工作行程共用的 found_chunk 旗標；
+    可傳給多次 mine_block_parallel 重複使用，不必每次重建行程。
+    """
+    def __init__(self, processes: int = None):
+        self.processes = processes or os.cpu_count() or 1
+        self.found_chunk = multiprocessing.Value('q', -1)
+        super().__init__(self.processes, initializer=_init_miner, initargs=(self.found_chunk,))
+
+def mine_block_parallel(previous_hash: str, target_prefix: str, processes: int = None,
+                        chunk_size: int = NONCE_CHUNK, start: int = 0, stop: int = MAX_NONCE + 1,
+                        pool: MinerPool = None, progress=None):
+    """
+    多行程版 mine_block：將 nonce 空間 [start, stop) 切成連續區塊依序分派給工作行程。
+    某區塊找到解後即停止派送並取消其後的區塊，但仍等待其前的區塊完成，
+    因此必定回傳最小的合法 nonce，結果與 mine_block 完全相同。
+    pool 為 MinerPool 時沿用該行程池（processes 以 pool 為準），否則自行建立一個。
+    progress(done_below) 在「小於 done_below 的 nonce 皆已確認無解」的界線前進時被呼叫，
+    可用來寫 checkpoint。回傳時 pool 中不會留下仍在執行的區塊。
+    """
+    if pool is None:
+        with MinerPool(processes) as pool:
+            return mine_block_parallel(previous_hash, target_prefix, chunk_size=chunk_size,
+                                       start=start, stop=stop, pool=pool, progress=progress)
+    chunks = -(-(stop - start) // chunk_size)
+    found_chunk = pool.found_chunk
+    found_chunk.value = chunks
+    best = None
+    next_index = 0
+    pending = {}
+    exhausted = set()  # 已完成且無解、但其前仍有未完成區塊的區塊
+    done = 0           # 區塊 0 .. done-1 皆已完成且無解
+    while True:
+        while best is None and next_index < chunks and len(pending) < pool.processes * 2:
+            chunk_start = start + next_index * chunk_size
+            future = pool.submit(_mine_chunk, previous_hash, target_prefix, next_index,
+                                 chunk_start, min(chunk_start + chunk_size, stop))
+            pending[future] = next_index
+            next_index += 1
+        if not pending:
             break
+        finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in finished:
+            del pending[future]
+            index, block_hash, nonce_hex = future.result()
+            if block_hash:
+                if best is None or index < best[0]:
+                    best = (index, block_hash, nonce_hex)
+                    found_chunk.value = index
+            else:
+                exhausted.add(index)
+        advanced = done
+        while done in exhausted:
+            exhausted.discard(done)
+            done += 1
+        if progress and done != advanced:
+            progress(min(start + done * chunk_size, stop))
+        # 其前的區塊都已完成，結果即為最小 nonce
+        if best and all(index > best[0] for index in pending.values()):
+            break
+    # 通知仍在執行的區塊放棄，並等它們結束，讓 pool 可直接用於下一次呼叫
+    found_chunk.value = -1
+    for future in pending:
+        future.cancel()
+    wait(pending)
+    if best is None:
+        return None, None
+    return best[1], best[2]
+
+def _load_checkpoint(path: str):
+    """讀取 checkpoint（JSON），不存在或損毀時回傳 None。"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _save_checkpoint(path: str, checkpoint: dict):
+    """先寫入暫存檔再 os.replace，確保 checkpoint 不會只寫一半。"""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(checkpoint, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+def _write_log(log, entry: str) -> int:
+    """寫入一行日誌並立即落盤，回傳目前日誌大小。"""
+    log.write(entry + "\n")
+    log.flush()
+    os.fsync(log.fileno())
+    return log.tell()
+
+def _round_stats(attempts: int, elapsed: float) -> str:
+    rate = attempts / elapsed if elapsed > 0 else 0.0
+    return f"attempts={attempts} time={elapsed:.2f}s rate={rate:.0f} H/s"
+
+def run_mining(student_id: str, total_rounds: int = 6, log_path: str = "logger_.log",
+               checkpoint_path: str = "mining.ckpt", processes: int = 1):
+    """
+    逐輪挖礦並在每輪完成時立即寫入日誌，每 CHECKPOINT_NONCES 個 nonce
+    記錄一次 checkpoint (round, previous_hash, last_nonce)；
+    重新執行時從上次的 checkpoint 接續，並將日誌截斷到該 checkpoint 時的大小，
+    避免重複的輪次紀錄。每輪紀錄附上 attempts、耗時與 H/s。
+    processes > 1 時整個執行只建立一個 MinerPool，每輪以一次 mine_block_parallel
+    挖完剩餘的 nonce 空間，checkpoint 由其 progress 回呼寫入（取所有區塊皆已完成的界線），
+    結果相同。
+    """
+    checkpoint = _load_checkpoint(checkpoint_path)
+    if checkpoint is None or checkpoint["student_id"] != student_id:
+        preImage = sha256_hash(student_id)
+
+        # 決定起始區塊：比較 preImage 與 student_id，第一個不相符的位置即為 starting_block
+        starting_block = 1
+        for i in range(min(len(student_id), len(preImage))):
+            if preImage[i] != student_id[i]:
+                starting_block = i + 1
+                break
 
-    # 5. 將日誌寫入 logger.log 檔案
-    with open("logger_.log", "w", encoding="utf-8") as f:
-        for entry in log_entries:
-            f.write(entry + "\n")
+        with open(log_path, "w", encoding="utf-8") as log:
+            log_size = _write_log(log, f"{get_current_time()} [INFO] [preImage] {preImage}")
+        checkpoint = {
+            "student_id": student_id,
+            "round": starting_block,
+            "end_round": starting_block + total_rounds,
+            "previous_hash": preImage,
+            "last_nonce": -1,
+            "elapsed": 0.0,
+            "log_size": log_size,
+        }
+        _save_checkpoint(checkpoint_path, checkpoint)
+
+    with open(log_path, "a", encoding="utf-8") as log, \
+            (MinerPool(processes) if processes > 1 else contextlib.nullcontext()) as pool:
+        log.truncate(checkpoint["log_size"])
+        while checkpoint["round"] < checkpoint["end_round"]:
+            round_num = checkpoint["round"]
+            previous_hash = checkpoint["previous_hash"]
+            target_prefix = student_id[:round_num]
+
+            # 先檢查是否已經符合 (without nonce)
+            if checkpoint["last_nonce"] < 0 and previous_hash.startswith(target_prefix):
+                checkpoint["log_size"] = _write_log(
+                    log, f"{get_current_time()} [INFO] [Round {round_num} without nonce] {previous_hash} "
+                         f"{_round_stats(0, 0.0)}")
+                checkpoint["round"] += 1
+                _save_checkpoint(checkpoint_path, checkpoint)
+                continue
+
+            # 每確認 CHECKPOINT_NONCES 個 nonce 無解就寫入一次 checkpoint
+            block_hash = nonce_hex = None
+            nonce = checkpoint["last_nonce"] + 1
+            if pool is not None:
+                started = time.perf_counter()
+                elapsed = checkpoint["elapsed"]
+
+                def save_progress(done_below):
+                    if done_below - 1 - checkpoint["last_nonce"] >= CHECKPOINT_NONCES:
+                        checkpoint.update(last_nonce=done_below - 1,
+                                          elapsed=elapsed + time.perf_counter() - started)
+                        _save_checkpoint(checkpoint_path, checkpoint)
+
+                block_hash, nonce_hex = mine_block_parallel(previous_hash, target_prefix, start=nonce,
+                                                            pool=pool, progress=save_progress)
+                checkpoint["elapsed"] = elapsed + time.perf_counter() - started
+            while pool is None and nonce <= MAX_NONCE:
+                stop = min(nonce + CHECKPOINT_NONCES, MAX_NONCE + 1)
+                started = time.perf_counter()
+                block_hash, nonce_hex = _mine_range(previous_hash, target_prefix, nonce, stop)
+                checkpoint["elapsed"] += time.perf_counter() - started
+                if block_hash:
+                    break
+                checkpoint["last_nonce"] = stop - 1
+                _save_checkpoint(checkpoint_path, checkpoint)
+                nonce = stop
+
+            if block_hash:
+                attempts = int(nonce_hex, 16) + 1
+                checkpoint["log_size"] = _write_log(
+                    log, f"{get_current_time()} [INFO] [Round {round_num} with nonce {nonce_hex}] {block_hash} "
+                         f"{_round_stats(attempts, checkpoint['elapsed'])}")
+                checkpoint.update(round=round_num + 1, previous_hash=block_hash, last_nonce=-1, elapsed=0.0)
+                _save_checkpoint(checkpoint_path, checkpoint)
+            else:
+                # 未找到符合要求的區塊 => 僅記錄一行錯誤訊息
+                _write_log(log, f"{get_current_time()} [EROR] [Round {round_num}] not found with running out of nonce "
+                                f"{_round_stats(MAX_NONCE + 1, checkpoint['elapsed'])}")
+                break
+
+    # 全部完成，移除 checkpoint
+    os.remove(checkpoint_path)
+
+if __name__ == "__main__":
+    # 以學生證號作為種子 (範例：313553024)，至少挖到學生證前7位
+    run_mining("313553024", total_rounds=6, processes=os.cpu_count() or 1)
@@ -1,5 +1,14 @@
 import hashlib
 import os
+import struct
+from functools import lru_cache
+
+NONCE_SIZE = 16
+# v2 串流格式：標頭 = magic(4) + chunk 大小(4, big-endian) + nonce(16)，之後為各 chunk 密文
+V2_MAGIC = b'SHK\x02'
+V2_CHUNK_SIZE = 64 * 1024
+_V2_HEADER = struct.Struct('>4sI16s')
+PASSWORD_CACHE_SIZE = 64
 
 def generate_keystream(password: str, nonce: bytes, length: int) -> bytes:
     """
@@ -41,6 +50,119 @@ def decrypt(password: str, ciphertext: bytes) -> str:
     plaintext_bytes = bytes(a ^ b for a, b in zip(ciphertext_bytes, keystream))
     return plaintext_bytes.decode('utf-8')
 
+def _xor_bytes(data: bytes, keystream: bytes) -> bytes:
+    """
+    將 data 與等長（或更長）的 keystream 做 XOR，
+    以大整數一次完成整段運算，不逐位元組產生。
+    """
+    n = len(data)
+    return (int.from_bytes(data, 'big') ^ int.from_bytes(keystream[:n], 'big')).to_bytes(n, 'big')
+
+@lru_cache(maxsize=PASSWORD_CACHE_SIZE)
+def _password_state(password: str):
+    """
+    已吸收密碼（UTF-8）的 SHAKE128 狀態，依密碼做 LRU 快取。
+    回傳的物件為共用狀態，使用時一律先 copy() 再 update。
+    """
+    return hashlib.shake_128(password.encode('utf-8'))
+
+def generate_chunk_keystream(password: str, nonce: bytes, index: int, length: int) -> bytes:
+    """
+    v2：第 index 個 chunk 的金鑰流 = SHAKE128(password || nonce || index(8 bytes, big-endian))。
+    每個 chunk 獨立派生，因此可以隨機存取任一 chunk。
+    """
+    shake = _password_state(password).copy()
+    shake.update(nonce + index.to_bytes(8, 'big'))
+    return shake.digest(length)
+
+def encrypt_many(password: str, plaintexts) -> list[bytes]:
+    """
+    批次加密多則訊息，輸出格式與 encrypt 相同（nonce + 密文），可直接用 decrypt 解密。
+    密碼只吸收一次，每則訊息複製該狀態後補上自己的 nonce，並整段 XOR。
+    """
+    plaintexts = [p.encode('utf-8') for p in plaintexts]
+    nonces = os.urandom(NONCE_SIZE * len(plaintexts))
+    state = _password_state(password)
+    ciphertexts = []
+    for i, data in enumerate(plaintexts):
+        nonce = nonces[i * NONCE_SIZE:(i + 1) * NONCE_SIZE]
+        shake = state.copy()
+        shake.update(nonce)
+        ciphertexts.append(nonce + _xor_bytes(data, shake.digest(len(data))))
+    return ciphertexts
+
+def decrypt_many(password: str, ciphertexts) -> list[str]:
+    """批次解密 encrypt / encrypt_many 產生的密文。"""
+    state = _password_state(password)
+    plaintexts = []
+    for ciphertext in ciphertexts:
+        nonce, body = ciphertext[:NONCE_SIZE], ciphertext[NONCE_SIZE:]
+        shake = state.copy()
+        shake.update(nonce)
+        plaintexts.append(_xor_bytes(body, shake.digest(len(body))).decode('utf-8'))
+    return plaintexts
+
+def _read_full(src, size: int) -> bytes:
+    """從 src 讀滿 size bytes（除非已到結尾），避免管線短讀造成 chunk 邊界錯位。"""
+    data = src.read(size)
+    while data and len(data) < size:
+        more = src.read(size - len(data))
+        if not more:
+            break
+        data += more
+    return data
+
+def _read_v2_header(src):
+    header = _read_full(src, _V2_HEADER.size)
+    if len(header) != _V2_HEADER.size:
+        raise ValueError("ciphertext too short for v2 header")
+    magic, chunk_size, nonce = _V2_HEADER.unpack(header)
+    if magic != V2_MAGIC or chunk_size == 0:
+        raise ValueError("not a v2 SHAKE128 stream")
+    return chunk_size, nonce
+
+def encrypt_stream(password: str, src, dst, chunk_size: int = V2_CHUNK_SIZE):
+    """
+    v2 串流加密：src、dst 為二進位檔案物件。
+    先寫入標頭（含 16 字節隨機 nonce），再逐 chunk 讀取、XOR、寫出，
+    記憶體用量與檔案大小無關。
+    """
+    nonce = os.urandom(NONCE_SIZE)
+    dst.write(_V2_HEADER.pack(V2_MAGIC, chunk_size, nonce))
+    index = 0
+    while chunk := _read_full(src, chunk_size):
+        dst.write(_xor_bytes(chunk, generate_chunk_keystream(password, nonce, index, len(chunk))))
+        index += 1
+
+def decrypt_stream(password: str, src, dst):
+    """v2 串流解密：讀取標頭後逐 chunk 還原明文寫入 dst。"""
+    chunk_size, nonce = _read_v2_header(src)
+    index = 0
+    while chunk := _read_full(src, chunk_size):
+        dst.write(_xor_bytes(chunk, generate_chunk_keystream(password, nonce, index, len(chunk))))
+        index += 1
+
+def decrypt_chunk(password: str, src, index: int) -> bytes:
+    """
+    v2 隨機存取：src 為可 seek 的二進位檔案物件，
+    只讀取並解密第 index 個 chunk（超出範圍回傳 b''）。
+    """
+    src.seek(0)
+    chunk_size, nonce = _read_v2_header(src)
+    src.seek(_V2_HEADER.size + index * chunk_size)
+    chunk = _read_full(src, chunk_size)
+    return _xor_bytes(chunk, generate_chunk_keystream(password, nonce, index, len(chunk)))
+
+def encrypt_file(password: str, in_path: str, out_path: str, chunk_size: int = V2_CHUNK_SIZE):
+    """以 v2 格式加密整個檔案。"""
+    with open(in_path, 'rb') as src, open(out_path, 'wb') as dst:
+        encrypt_stream(password, src, dst, chunk_size)
+
+def decrypt_file(password: str, in_path: str, out_path: str):
+    """解密 v2 格式檔案。"""
+    with open(in_path, 'rb') as src, open(out_path, 'wb') as dst:
+        decrypt_stream(password, src, dst)
+
 # 示例使用
 if __name__ == '__main__':
     password = input("plesase enter your password: ")
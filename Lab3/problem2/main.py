@@ -1,3 +1,6 @@
+from collections import deque
+
+
 def compute_ic(text: str) -> float:
     """
     Compute and return the Index of Coincidence (IC) for the given text.
@@ -43,6 +46,101 @@ def decrypt_caesar(ciphertext: str, shift: int = 3) -> str:
     return plaintext
 
 
+STREAM_CHUNK = 1 << 20
+
+
+def caesar_table(shift: int = 3) -> bytes:
+    """
+    Build a bytes.translate table that shifts A-Z back by 'shift' positions.
+    Every other byte maps to itself, matching decrypt_caesar for ASCII input.
+    """
+    table = bytearray(range(256))
+    for i in range(26):
+        table[ord('A') + i] = ord('A') + (i - shift) % 26
+    return bytes(table)
+
+
+def decrypt_caesar_stream(src, dst, shift: int = 3, chunk_size: int = STREAM_CHUNK):
+    """
+    Streaming decrypt_caesar: read binary file object 'src' in chunks and write
+    each translated chunk to 'dst', so memory use does not depend on input size.
+    """
+    table = caesar_table(shift)
+    while chunk := src.read(chunk_size):
+        dst.write(chunk.translate(table))
+
+
+def decrypt_caesar_file(in_path: str, out_path: str, shift: int = 3, chunk_size: int = STREAM_CHUNK):
+    """Decrypt a whole file with decrypt_caesar_stream."""
+    with open(in_path, 'rb') as src, open(out_path, 'wb') as dst:
+        decrypt_caesar_stream(src, dst, shift, chunk_size)
+
+
+_UPPER_LETTERS = b'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+_NON_LETTERS = bytes(b for b in range(256) if b not in _UPPER_LETTERS)
+
+
+class ICTracker:
+    """
+    Index of Coincidence of a changing multiset of letters.
+    Keeps 26 counters and the running sum of f * (f - 1), so adding or
+    removing one letter (0-25) is O(1) and ic() needs no recount.
+    """
+    __slots__ = ('counts', 'total', 'pairs')
+
+    def __init__(self):
+        self.counts = [0] * 26
+        self.total = 0
+        self.pairs = 0  # sum( f_i * (f_i - 1) )
+
+    def add(self, letter: int):
+        f = self.counts[letter]
+        self.pairs += 2 * f  # (f + 1) * f - f * (f - 1)
+        self.counts[letter] = f + 1
+        self.total += 1
+
+    def remove(self, letter: int):
+        f = self.counts[letter]
+        self.pairs -= 2 * (f - 1)
+        self.counts[letter] = f - 1
+        self.total -= 1
+
+    def ic(self) -> float:
+        N = self.total
+        return self.pairs / (N * (N - 1)) if N > 1 else 0.0
+
+
+def sliding_ic(chunks, window: int, stride: int = 1):
+    """
+    Lazily yield (offset, ic) for every window of 'window' letters, moving
+    'stride' letters at a time. 'offset' is the index of the window's first
+    letter among all letters seen. 'chunks' is any iterable of str or bytes
+    pieces (e.g. file reads); only A-Z/a-z count, case-insensitively, and
+    memory stays O(window) however long the stream is.
+    """
+    tracker = ICTracker()
+    letters = deque()
+    seen = 0
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode('utf-8')
+        for byte in chunk.upper().translate(None, _NON_LETTERS):
+            letter = byte - ord('A')
+            tracker.add(letter)
+            letters.append(letter)
+            seen += 1
+            if len(letters) > window:
+                tracker.remove(letters.popleft())
+            if len(letters) == window and (seen - window) % stride == 0:
+                yield seen - window, tracker.ic()
+
+
+def sliding_ic_file(path: str, window: int, stride: int = 1, chunk_size: int = STREAM_CHUNK):
+    """sliding_ic over a file read in binary chunks."""
+    with open(path, 'rb') as f:
+        yield from sliding_ic(iter(lambda: f.read(chunk_size), b''), window, stride)
+
+
 if __name__ == '__main__':
     ciphertext = """\
     WKHUH DUHWZ RZDBV RIFRQ VWUXF WLQJD VRIWZ DUHGH VLJQR QHZDB
@@ -6,6 +6,11 @@
 
 """
 
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
 # 英文頻率表
 freqMap = {
     'A': 0.082, 'B': 0.015, 'C': 0.028, 'D': 0.043, 'E': 0.13,
@@ -66,6 +71,73 @@ def estimate_key_length(ciphertext: str, max_keylen: int = 12) -> int:
     return best_keylen
 
 
+# A~Z / a~z 對應到 0~25，其餘位元組對應到 255（濾除）
+_LETTER_INDEX = np.full(256, 255, dtype=np.uint8)
+_LETTER_INDEX[np.frombuffer(b'ABCDEFGHIJKLMNOPQRSTUVWXYZ', dtype=np.uint8)] = np.arange(26)
+_LETTER_INDEX[np.frombuffer(b'abcdefghijklmnopqrstuvwxyz', dtype=np.uint8)] = np.arange(26)
+
+def letter_indices(text) -> np.ndarray:
+    """
+    將文字（str 或 bytes）一次轉成字母索引陣列 (0~25, uint8)，
+    只保留 ASCII 英文字母，大小寫視為相同。
+    """
+    data = text.encode('utf-8') if isinstance(text, str) else text
+    idx = _LETTER_INDEX[np.frombuffer(data, dtype=np.uint8)]
+    return idx[idx != 255]
+
+def ic_by_key_length(letters: np.ndarray, max_keylen: int) -> np.ndarray:
+    """
+    一次計算金鑰長度 1~max_keylen 的平均 IC（第 k-1 個元素對應長度 k），
+    與 avg_ic_for_keylen 定義相同。每個長度只做一次 bincount，
+    得到 (k, 26) 的各子序列字母計數矩陣。
+    """
+    n = len(letters)
+    padded = np.zeros(n + max_keylen, dtype=np.intp)
+    padded[:n] = letters
+    codes = np.empty(n + max_keylen, dtype=np.intp)
+    result = np.zeros(max_keylen)
+    for k in range(1, max_keylen + 1):
+        rows = -(-n // k)
+        # 第 i 個字母屬於子序列 i % k，編碼為 (i % k) * 26 + letter
+        np.add(padded[:rows * k].reshape(rows, k), np.arange(0, 26 * k, 26), out=codes[:rows * k].reshape(rows, k))
+        counts = np.bincount(codes[:n], minlength=26 * k).reshape(k, 26)
+        sizes = counts.sum(axis=1)
+        valid = sizes > 1
+        if valid.any():
+            numer = (counts * (counts - 1)).sum(axis=1)[valid]
+            result[k - 1] = np.mean(numer / (sizes[valid] * (sizes[valid] - 1)))
+    return result
+
+def autocorrelation_by_shift(letters: np.ndarray, max_shift: int) -> np.ndarray:
+    """
+    Kasiski / 自相關：位移 d (1~max_shift) 時 letters[i] == letters[i+d] 的比例。
+    位移為金鑰長度倍數時比例接近英文的 IC（約 0.066），否則接近 1/26。
+    """
+    n = len(letters)
+    rates = np.zeros(max_shift)
+    for d in range(1, min(max_shift, n - 1) + 1):
+        rates[d - 1] = np.count_nonzero(letters[:-d] == letters[d:]) / (n - d)
+    return rates
+
+def key_length_scores(ciphertext, max_keylen: int = 12):
+    """
+    回傳 (ic, kasiski) 兩個長度為 max_keylen 的陣列：
+    ic[k-1] 為金鑰長度 k 的平均 IC；
+    kasiski[k-1] 為所有 k 的倍數位移上的平均自相關比例。
+    """
+    letters = letter_indices(ciphertext)
+    rates = autocorrelation_by_shift(letters, max_keylen)
+    kasiski = np.array([rates[k - 1::k].mean() for k in range(1, max_keylen + 1)])
+    return ic_by_key_length(letters, max_keylen), kasiski
+
+def estimate_key_length_fast(ciphertext, max_keylen: int = 12) -> int:
+    """
+    向量化版 estimate_key_length：回傳平均 IC 最大的金鑰長度（同分取最短）。
+    """
+    ic = ic_by_key_length(letter_indices(ciphertext), max_keylen)
+    return int(np.argmax(ic)) + 1 if ic.max() > 0 else 1
+
+
 def chi_square_score(text: str) -> float:
     """
     計算 text 與英文頻率分布 (freqMap) 的卡方值，
@@ -133,6 +205,50 @@ def recover_key(ciphertext: str, keylen: int) -> str:
         key_chars.append(key_char)
     return "".join(key_chars)
 
+STREAM_CHUNK = 1 << 20
+_LETTER_BYTES = b'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz'
+_NON_LETTER_BYTES = bytes(b for b in range(256) if b not in _LETTER_BYTES)
+_IS_LETTER = _LETTER_INDEX != 255
+
+# 依 A~Z 排列的英文期望頻率，以及 _ROTATIONS[s, L] = (L + s) % 26
+_EXPECTED_FREQ = np.array([freqMap[chr(ord('A') + i)] for i in range(26)])
+_ROTATIONS = (np.arange(26)[None, :] + np.arange(26)[:, None]) % 26
+
+def column_counts(letters: np.ndarray, keylen: int) -> np.ndarray:
+    """回傳 (keylen, 26) 的各子序列字母計數矩陣。"""
+    cols = np.arange(len(letters)) % keylen
+    return np.bincount(cols * 26 + letters, minlength=26 * keylen).reshape(keylen, 26)
+
+def recover_key_fast(ciphertext, keylen: int) -> str:
+    """
+    直方圖旋轉版 recover_key：每個子序列只計數一次成 26 格直方圖，
+    位移 s 後的字母 L 計數即為原直方圖第 (L + s) % 26 格，
+    因此 26 種位移的卡方值可用一次索引旋轉與矩陣運算同時求得，
+    結果與 recover_key 相同。
+    """
+    counts = column_counts(letter_indices(ciphertext), keylen)
+    observed = counts[:, _ROTATIONS]                      # (keylen, 26 位移, 26 字母)
+    expected = (counts.sum(axis=1)[:, None] * _EXPECTED_FREQ)[:, None, :]
+    chi2 = ((observed - expected) ** 2 / (expected + 1e-9)).sum(axis=2)
+    return "".join(chr(ord('A') + int(shift)) for shift in chi2.argmin(axis=1))
+
+def _recover_one(ciphertext, keylen, max_keylen):
+    if keylen is None:
+        keylen = estimate_key_length_fast(ciphertext, max_keylen)
+    return recover_key_fast(ciphertext, keylen)
+
+def recover_keys(ciphertexts, keylen: int = None, max_keylen: int = 12, processes: int = None) -> list[str]:
+    """
+    批次復原多則密文的金鑰，分散到多個工作行程處理，依輸入順序回傳。
+    keylen 為 None 時，每則密文各自以 estimate_key_length_fast 估計金鑰長度。
+    """
+    ciphertexts = list(ciphertexts)
+    processes = processes or os.cpu_count() or 1
+    chunksize = max(1, len(ciphertexts) // (processes * 4))
+    with ProcessPoolExecutor(processes) as pool:
+        return list(pool.map(_recover_one, ciphertexts, [keylen] * len(ciphertexts),
+                             [max_keylen] * len(ciphertexts), chunksize=chunksize))
+
 
 def vigenere_decrypt(ciphertext: str, key: str) -> str:
     """
@@ -157,6 +273,43 @@ def vigenere_decrypt(ciphertext: str, key: str) -> str:
             plaintext.append(c)
     return "".join(plaintext)
 
+def _shift_table(shift: int) -> bytes:
+    """bytes.translate 用的表：大寫、小寫字母各自向前移 shift 位，其餘位元組不變。"""
+    table = bytearray(range(256))
+    for i in range(26):
+        table[ord('A') + i] = ord('A') + (i - shift) % 26
+        table[ord('a') + i] = ord('a') + (i - shift) % 26
+    return bytes(table)
+
+def vigenere_decrypt_stream(src, dst, key: str, chunk_size: int = STREAM_CHUNK):
+    """
+    串流版 vigenere_decrypt：src、dst 為二進位檔案物件，逐 chunk 解密。
+    每個金鑰字元預先建好一張位移表；每個 chunk 先濾出字母，
+    再對同一金鑰相位的字母（間隔為金鑰長度的切片）一次 translate，
+    最後放回原位置。key_index 跨 chunk 延續，大小寫與標點保持不變。
+    只處理 ASCII 英文字母；UTF-8 多位元組字元不受影響。
+    """
+    tables = [_shift_table(ord(k.upper()) - ord('A')) for k in key]
+    key_len = len(tables)
+    key_index = 0
+    while chunk := src.read(chunk_size):
+        letters = chunk.translate(None, _NON_LETTER_BYTES)
+        plain = bytearray(letters)
+        for phase in range(min(key_len, len(letters))):
+            plain[phase::key_len] = letters[phase::key_len].translate(tables[(key_index + phase) % key_len])
+        key_index = (key_index + len(letters)) % key_len
+        if len(letters) == len(chunk):
+            dst.write(plain)
+            continue
+        out = np.frombuffer(chunk, dtype=np.uint8).copy()
+        out[_IS_LETTER[out]] = np.frombuffer(plain, dtype=np.uint8)
+        dst.write(out.tobytes())
+
+def vigenere_decrypt_file(in_path: str, out_path: str, key: str, chunk_size: int = STREAM_CHUNK):
+    """以 vigenere_decrypt_stream 解密整個檔案。"""
+    with open(in_path, 'rb') as src, open(out_path, 'wb') as dst:
+        vigenere_decrypt_stream(src, dst, key, chunk_size)
+
 
 def main():
     try:
@@ -167,11 +320,11 @@ def main():
         return
 
     # 估計金鑰長度 (根據提示金鑰長度可能 < 8)
-    estimated_keylen = estimate_key_length(ciphertext, max_keylen=8)
+    estimated_keylen = estimate_key_length_fast(ciphertext, max_keylen=8)
     print(f"估計的金鑰長度: {estimated_keylen}")
 
     # 利用卡方檢定恢復金鑰
-    recovered_key = recover_key(ciphertext, estimated_keylen)
+    recovered_key = recover_key_fast(ciphertext, estimated_keylen)
     print(f"恢復的金鑰: {recovered_key}")
 
     # 使用恢復的金鑰進行 Vigenère 解密
@@ -1,7 +1,13 @@
+import math
 import random
+from fractions import Fraction
 from itertools import permutations
 from collections import defaultdict
 
+import numpy as np
+
+BATCH_TRIALS = 1 << 20  # 每批模擬的次數，限制記憶體用量
+
 def naive_shuffle(cards):
     """Naive Shuffle: 每次都從整個 range(0, len(cards)-1) 取隨機索引並交換。"""
     for i in range(len(cards)):
@@ -23,20 +29,157 @@ def simulate(shuffle_fn, trials=1000000):
         results[tuple(cards)] += 1
     return results
 
-def print_all_permutations(title, results):
-    """強制生成所有24種排列，確保未出現的排列顯示次數為 0。"""
+def swap_schedule(shuffle_fn, n):
+    """
+    將洗牌演算法描述成交換步驟 [(i, k), ...]：
+    依序把位置 i 與 [0, k) 中均勻隨機的位置交換。
+    """
+    if shuffle_fn is naive_shuffle:
+        return [(i, n) for i in range(n)]
+    if shuffle_fn is fisher_yates_shuffle:
+        return [(i, i + 1) for i in range(n - 1, 0, -1)]
+    raise ValueError(f"unsupported shuffle function: {shuffle_fn.__name__}")
+
+def lehmer_rank(perms):
+    """
+    每一列為 0..n-1 的排列，回傳其字典序排名 (Lehmer code)，
+    與 sorted(permutations(range(n))) 的索引一致。
+    """
+    n = perms.shape[1]
+    rank = np.zeros(len(perms), dtype=np.int64)
+    for i in range(n):
+        smaller = (perms[:, i + 1:] < perms[:, i:i + 1]).sum(axis=1)
+        rank = rank * (n - i) + smaller
+    return rank
+
+def _shuffle_batch(rng, steps, n, size):
+    """對 size 次試驗同時執行交換步驟，回傳長度 n! 的排名次數陣列。"""
+    rows = np.arange(size)
+    cards = np.tile(np.arange(n, dtype=np.int8), (size, 1))
+    for i, k in steps:
+        j = rng.integers(0, k, size)
+        picked = cards[rows, j]
+        cards[rows, j] = cards[:, i]
+        cards[:, i] = picked
+    return np.bincount(lehmer_rank(cards), minlength=math.factorial(n))
+
+def simulate_batched(shuffle_fn, trials=1000000, n=4, seed=None):
+    """
+    NumPy 批次版 simulate：一次抽出整批試驗的隨機索引，
+    每個交換步驟對整批同時進行，最後以 Lehmer 排名 + bincount 統計。
+    回傳長度 n! 的次數陣列（索引即排名），n 最多約 10。
+    """
+    rng = np.random.default_rng(seed)
+    steps = swap_schedule(shuffle_fn, n)
+    counts = np.zeros(math.factorial(n), dtype=np.int64)
+    done = 0
+    while done < trials:
+        size = min(BATCH_TRIALS, trials - done)
+        counts += _shuffle_batch(rng, steps, n, size)
+        done += size
+    return counts
+
+def _chi2_sf(x, dof):
+    """卡方分布的右尾機率，使用 Wilson-Hilferty 常態近似（dof 較大時相當準確）。"""
+    z = ((x / dof) ** (1 / 3) - (1 - 2 / (9 * dof))) / math.sqrt(2 / (9 * dof))
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+def simulate_until_verdict(shuffle_fn, n=4, confidence=0.99, batch=10000,
+                           max_trials=1000000, tolerance=0.01, seed=None):
+    """
+    序列檢定版模擬：每批 batch 次後更新排名次數並檢定是否偏離均勻分布，
+    達到指定信心水準即提早停止。回傳 (verdict, trials, counts)：
+      - 'biased'：卡方檢定 p 值 < alpha / 最多檢視次數（Bonferroni 修正重複檢視）
+      - 'uniform'：以多項分布 L1 集中不等式 P(|p̂ - p|_1 >= ε) <= (2^k - 2) e^{-Nε²/2}
+        得到的 TVD 上界小於 tolerance
+      - 'inconclusive'：到 max_trials 仍無法判定
+    其中 alpha = 1 - confidence，k = n!。
+    """
+    rng = np.random.default_rng(seed)
+    steps = swap_schedule(shuffle_fn, n)
+    cells = math.factorial(n)
+    alpha = (1 - confidence) / math.ceil(max_trials / batch)
+    counts = np.zeros(cells, dtype=np.int64)
+    trials = 0
+    while trials < max_trials:
+        size = min(batch, max_trials - trials)
+        counts += _shuffle_batch(rng, steps, n, size)
+        trials += size
+        expected = trials / cells
+        chi2 = float(((counts - expected) ** 2).sum() / expected)
+        if cells > 1 and _chi2_sf(chi2, cells - 1) < alpha:
+            return 'biased', trials, counts
+        eps = math.sqrt(2 * (cells * math.log(2) - math.log(alpha)) / trials)
+        tvd = 0.5 * float(np.abs(counts / trials - 1 / cells).sum())
+        if tvd + eps / 2 < tolerance:
+            return 'uniform', trials, counts
+    return 'inconclusive', trials, counts
+
+def exact_distribution(shuffle_fn, n=4, exact=False):
+    """
+    精確計算洗牌結果的機率分布，取代抽樣。
+    以「各排名的交換路徑數」向量（整數）逐個交換步驟傳播：
+    每種交換 (i, j) 對排名是一個置換，預先算好其排名對應表（n 進位編碼 + 二分搜尋），
+    一步就是把向量依對應表搬移後累加。最後除以總路徑數。
+    回傳 (probabilities, tvd)：exact=True 時為 Fraction，否則為 float 陣列/數值；
+    tvd 為與均勻分布的 total-variation distance。n 約 9 以內可行。
+    """
+    perms = np.array(list(permutations(range(n))), dtype=np.int64)  # 依字典序，索引即排名
+    size = len(perms)
+    # 以 n 進位編碼排列；字典序排列的編碼遞增，交換後的排名可用 searchsorted 查出
+    weights = n ** np.arange(n - 1, -1, -1, dtype=np.int64)
+    codes = perms @ weights
+    paths = np.zeros(size, dtype=np.int64)
+    paths[0] = 1  # 初始為原始順序
+    total = 1
+    rank_maps = {}
+    for i, k in swap_schedule(shuffle_fn, n):
+        stepped = np.zeros_like(paths)
+        for j in range(k):
+            if j == i:
+                stepped += paths
+                continue
+            key = (min(i, j), max(i, j))
+            if key not in rank_maps:
+                delta = (perms[:, j] - perms[:, i]) * (weights[i] - weights[j])
+                rank_maps[key] = np.searchsorted(codes, codes + delta)
+            stepped[rank_maps[key]] += paths
+        paths = stepped
+        total *= k
+
+    deviation = int(np.abs(paths * size - total).sum())  # = 2 * tvd * total * n!
+    if exact:
+        return [Fraction(int(c), total) for c in paths], Fraction(deviation, 2 * total * size)
+    return paths / total, deviation / (2 * total * size)
+
+def counts_to_results(counts, cards=(1, 2, 3, 4)):
+    """將排名次數陣列轉成 {排列 tuple: 次數}，可直接交給 print_all_permutations。"""
+    return {perm: int(c) for perm, c in zip(permutations(sorted(cards)), counts)}
+
+def print_all_permutations(title, results, cards=(1, 2, 3, 4)):
+    """強制生成所有 n! 種排列，確保未出現的排列顯示次數為 0。"""
     print(title)
-    all_perms = permutations([1, 2, 3, 4])  # 生成所有可能排列
+    all_perms = permutations(cards)  # 生成所有可能排列
     for perm in sorted(all_perms):
         count = results.get(perm, 0)         # 若不存在則返回 0
         print(f"{list(perm)}: {count}")
 
 if __name__ == "__main__":
     # 模擬兩種洗牌方法
-    naive_counts = simulate(naive_shuffle, 1000000)
-    fy_counts = simulate(fisher_yates_shuffle, 1000000)
+    naive_counts = counts_to_results(simulate_batched(naive_shuffle, 1000000))
+    fy_counts = counts_to_results(simulate_batched(fisher_yates_shuffle, 1000000))
 
     # 輸出完整排列結果
     print_all_permutations("Naive Shuffle Results:", naive_counts)
     print("\n" + "="*50 + "\n")
     print_all_permutations("Fisher-Yates Shuffle Results:", fy_counts)
+
+    # 精確分布與均勻分布的距離
+    print("\n" + "="*50 + "\n")
+    print(f"Naive Shuffle exact TVD from uniform: {exact_distribution(naive_shuffle)[1]:.6f}")
+    print(f"Fisher-Yates Shuffle exact TVD from uniform: {exact_distribution(fisher_yates_shuffle)[1]:.6f}")
+
+    # 序列檢定：判定結果明確即停止
+    for name, fn in (("Naive Shuffle", naive_shuffle), ("Fisher-Yates Shuffle", fisher_yates_shuffle)):
+        verdict, trials, _ = simulate_until_verdict(fn)
+        print(f"{name} sequential audit: {verdict} after {trials} trials")
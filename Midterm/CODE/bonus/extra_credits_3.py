@@ -1,31 +1,44 @@
-import galois
+import os
+import sys
 
-# 1. 建立 GF(2) 與兩個四次多項式
-F2 = galois.GF(2)
-f1 = galois.Poly([1, 0, 0, 1, 1], field=F2)      # x⁴ + x + 1
-f2 = galois.Poly([1, 1, 0, 0, 1], field=F2)      # x⁴ + x³ + 1
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from gf2poly import GF2Poly
+
+# 1. 建立 GF(2) 上的兩個四次多項式（以 GF2Poly 表示，不需載入 galois）
+f1 = GF2Poly.from_coeffs([1, 0, 0, 1, 1])      # x⁴ + x + 1
+f2 = GF2Poly.from_coeffs([1, 1, 0, 0, 1])      # x⁴ + x³ + 1
 
 print("Is f1(x) irreducible? ", f1.is_irreducible())
 print("Is f2(x) irreducible? ", f2.is_irreducible())
 
-# 2. 以 f1、f2 分別建立 GF(2⁴)
-GF1 = galois.GF(2**4, irreducible_poly=f1)
-GF2 = galois.GF(2**4, irreducible_poly=f2)
-
-# x 在各擴域中的表示（0b0010 = 2）
-x1 = GF1(2)
-x2 = GF2(2)
+# 2. 以 f1、f2 分別作為 GF(2⁴) 的模多項式，x 即 0b0010 = 2
+x = GF2Poly.x()
 
-print("Order of x modulo f1(x) =", x1.multiplicative_order())
-print("Is f1(x) primitive?     ", x1.multiplicative_order() == 15)
-print("Order of x modulo f2(x) =", x2.multiplicative_order())
-print("Is f2(x) primitive?     ", x2.multiplicative_order() == 15)
+order1 = x.multiplicative_order(f1)
+order2 = x.multiplicative_order(f2)
+print("Order of x modulo f1(x) =", order1)
+print("Is f1(x) primitive?     ", order1 == 15)
+print("Order of x modulo f2(x) =", order2)
+print("Is f2(x) primitive?     ", order2 == 15)
 
-# 3. 列印 x^k (k = 1…15) 在兩個體中的值
+# 3. 列印 x^k (k = 1…15) 在兩個體中的值（以整數表示，同 galois 的預設顯示）
 print("\nPowers of x modulo f1(x):")
 for k in range(1, 16):
-    print(f"x^{k} ≡ {x1 ** k}")
+    print(f"x^{k} ≡ {x.powmod(k, f1).v}")
 
 print("\nPowers of x modulo f2(x):")
 for k in range(1, 16):
-    print(f"x^{k} ≡ {x2 ** k}")
+    print(f"x^{k} ≡ {x.powmod(k, f2).v}")
+
+# 4. 以 galois 交叉驗證（python extra_credits_3.py --check，延遲載入 galois）
+if '--check' in sys.argv[1:]:
+    import galois
+
+    F2 = galois.GF(2)
+    for f, order in ((f1, order1), (f2, order2)):
+        g = galois.Poly(f.coeffs(), field=F2)
+        assert g.is_irreducible() == f.is_irreducible()
+        field = galois.GF(2**4, irreducible_poly=g)
+        assert field(2).multiplicative_order() == order
+        assert all(int(field(2) ** k) == x.powmod(k, f).v for k in range(1, 16))
+    print("\n與 galois 結果一致")
@@ -0,0 +1,207 @@
+"""
+GF(2)[x] 多項式，以 Python 整數儲存：第 i 個 bit 為 x^i 的係數。
+加法即 XOR，乘法為無進位乘法 (carry-less multiply)，除法為位移 XOR 長除法，
+取代熱路徑上的 sympy Poly 與 galois.Poly。
+"""
+
+
+class GF2Poly:
+    __slots__ = ('v',)
+
+    def __init__(self, v: int = 0):
+        if v < 0:
+            raise ValueError("GF2Poly needs a non-negative bit mask")
+        self.v = v
+
+    @classmethod
+    def from_coeffs(cls, coeffs) -> "GF2Poly":
+        """由高次到低次的係數建立（同 galois.Poly([1, 0, 0, 1, 1]) 的順序）"""
+        v = 0
+        for c in coeffs:
+            v = (v << 1) | (c & 1)
+        return cls(v)
+
+    @classmethod
+    def from_bits(cls, bits) -> "GF2Poly":
+        """bits[i] 為 x^i 的係數（例如序列 s 對應 S(x) = Σ s_i x^i）"""
+        v = 0
+        for i, b in enumerate(bits):
+            if b & 1:
+                v |= 1 << i
+        return cls(v)
+
+    @classmethod
+    def x(cls, k: int = 1) -> "GF2Poly":
+        """單項式 x^k"""
+        return cls(1 << k)
+
+    @property
+    def degree(self) -> int:
+        """次數；零多項式為 -1"""
+        return self.v.bit_length() - 1
+
+    def coeffs(self) -> list[int]:
+        """由高次到低次的係數"""
+        return [(self.v >> i) & 1 for i in range(self.degree, -1, -1)]
+
+    # ---- 比較 ----
+    def __eq__(self, other):
+        if isinstance(other, GF2Poly):
+            return self.v == other.v
+        if isinstance(other, int):
+            return self.v == other
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.v)
+
+    def __bool__(self):
+        return self.v != 0
+
+    # ---- 算術 ----
+    def __add__(self, other: "GF2Poly") -> "GF2Poly":
+        return GF2Poly(self.v ^ other.v)
+
+    __sub__ = __add__
+    __xor__ = __add__
+
+    def __mul__(self, other: "GF2Poly") -> "GF2Poly":
+        a, b = self.v, other.v
+        if a.bit_count() < b.bit_count():
+            a, b = b, a
+        r = 0
+        while b:
+            low = b & -b
+            r ^= a << (low.bit_length() - 1)
+            b ^= low
+        return GF2Poly(r)
+
+    def __divmod__(self, other: "GF2Poly"):
+        b = other.v
+        if b == 0:
+            raise ZeroDivisionError("GF2Poly division by zero")
+        a = self.v
+        db = b.bit_length()
+        q = 0
+        while a.bit_length() >= db:
+            shift = a.bit_length() - db
+            q |= 1 << shift
+            a ^= b << shift
+        return GF2Poly(q), GF2Poly(a)
+
+    def __floordiv__(self, other: "GF2Poly") -> "GF2Poly":
+        return divmod(self, other)[0]
+
+    def __mod__(self, other: "GF2Poly") -> "GF2Poly":
+        return divmod(self, other)[1]
+
+    def __pow__(self, e: int, modulus: "GF2Poly" = None) -> "GF2Poly":
+        if modulus is not None:
+            return self.powmod(e, modulus)
+        if e < 0:
+            raise ValueError("negative exponent")
+        result, base = GF2Poly(1), self
+        while e:
+            if e & 1:
+                result = result * base
+            base = base * base
+            e >>= 1
+        return result
+
+    def powmod(self, e: int, modulus: "GF2Poly") -> "GF2Poly":
+        """self^e mod modulus（平方乘法）"""
+        if e < 0:
+            raise ValueError("negative exponent")
+        result, base = GF2Poly(1) % modulus, self % modulus
+        while e:
+            if e & 1:
+                result = result * base % modulus
+            base = base * base % modulus
+            e >>= 1
+        return result
+
+    # ---- 歐幾里得演算法 ----
+    def gcd(self, other: "GF2Poly") -> "GF2Poly":
+        a, b = self, other
+        while b:
+            a, b = b, a % b
+        return a.monic()
+
+    def egcd(self, other: "GF2Poly"):
+        """回傳 (g, s, t)，滿足 s·self + t·other = g = gcd(self, other)"""
+        r0, r1 = self, other
+        s0, s1 = GF2Poly(1), GF2Poly(0)
+        t0, t1 = GF2Poly(0), GF2Poly(1)
+        while r1:
+            q, r2 = divmod(r0, r1)
+            r0, r1 = r1, r2
+            s0, s1 = s1, s0 - q * s1
+            t0, t1 = t1, t0 - q * t1
+        return r0, s0, t0
+
+    def monic(self) -> "GF2Poly":
+        """GF(2) 上非零多項式的首項係數必為 1，正規化後即為自身"""
+        return self
+
+    # ---- 不可約性與階 ----
+    def is_irreducible(self) -> bool:
+        """
+        Rabin 測試：n 次多項式 f 不可約 ⇔ x^(2^n) ≡ x (mod f)，
+        且對 n 的每個質因數 q，gcd(x^(2^(n/q)) - x, f) = 1。
+        """
+        n = self.degree
+        if n < 1:
+            return False
+        x = GF2Poly.x() % self
+        for q in _prime_factors(n):
+            if (_frobenius(x, n // q, self) - x).gcd(self) != GF2Poly(1):
+                return False
+        return _frobenius(x, n, self) == x
+
+    def multiplicative_order(self, modulus: "GF2Poly") -> int:
+        """
+        self 在 GF(2)[x] / (modulus) 中的乘法階；modulus 須不可約，
+        群的階為 2^n - 1，逐一除去其質因數求最小階。
+        """
+        if not self % modulus:
+            raise ValueError("zero has no multiplicative order")
+        order = (1 << modulus.degree) - 1
+        for p in _prime_factors(order):
+            while order % p == 0 and self.powmod(order // p, modulus) == 1:
+                order //= p
+        return order
+
+    # ---- 顯示 ----
+    def __str__(self) -> str:
+        """與 sympy 的 as_expr() 相同格式，例如 x**4 + x**3 + 1"""
+        if not self.v:
+            return "0"
+        terms = []
+        for i in range(self.degree, -1, -1):
+            if (self.v >> i) & 1:
+                terms.append("1" if i == 0 else "x" if i == 1 else f"x**{i}")
+        return " + ".join(terms)
+
+    def __repr__(self) -> str:
+        return f"GF2Poly({self})"
+
+
+def _frobenius(a: GF2Poly, k: int, modulus: GF2Poly) -> GF2Poly:
+    """a^(2^k) mod modulus：連續平方 k 次"""
+    for _ in range(k):
+        a = a * a % modulus
+    return a
+
+
+def _prime_factors(n: int) -> list[int]:
+    factors = []
+    p = 2
+    while p * p <= n:
+        if n % p == 0:
+            factors.append(p)
+            while n % p == 0:
+                n //= p
+        p += 1
+    if n > 1:
+        factors.append(n)
+    return factors
@@ -0,0 +1,118 @@
+"""
+NIST SP 800-22 線性複雜度測試 (Linear Complexity Test)
+
+將位元檔（二進位檔，每個 byte 由最高位開始）切成 N 個 M bits 的區塊，
+以 berlekamp_massey_packed 求每個區塊的線性複雜度 L_i，再對
+T_i = (-1)^M (L_i - μ) + 2/9 的七個類別做卡方檢定。
+
+檔案以 mmap 開啟，區塊分批派給多個工作行程，依序串流取回各區塊的 L_i。
+
+用法：
+    python linear_complexity.py <bit file> [M]
+未給檔案時，改以 Lab3/problem1 的 SHAKE128 金鑰流（1,000,000 bits）示範，
+並以 M = BLOCK_SIZE 與 M = 2000 各跑一次。
+"""
+
+import math
+import mmap
+import os
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+from main import berlekamp_massey_packed
+
+BLOCK_SIZE = 500        # M，NIST 建議 500 ≤ M ≤ 5000
+BLOCKS_PER_TASK = 64    # 每個工作單位處理的區塊數
+# T_i 落在 (-∞,-2.5], (-2.5,-1.5], ..., (1.5,2.5], (2.5,∞) 的理論機率
+PI = [0.010417, 0.03125, 0.125, 0.5, 0.25, 0.0625, 0.020833]
+
+_mm = None
+_M = 0
+
+
+def _read_block(mm, index: int, M: int) -> int:
+    """第 index 個區塊（M bits）以 MSB-first 整數回傳。"""
+    start = index * M
+    b0, b1 = start // 8, (start + M + 7) // 8
+    val = int.from_bytes(mm[b0:b1], 'big')
+    return (val >> (b1 * 8 - start - M)) & ((1 << M) - 1)
+
+
+def _init_worker(path: str, M: int):
+    global _mm, _M
+    with open(path, 'rb') as f:
+        _mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    _M = M
+
+
+def _block_range(task):
+    start, stop = task
+    return [berlekamp_massey_packed(_read_block(_mm, i, _M), _M)[1] for i in range(start, stop)]
+
+
+def block_complexities(path: str, M: int = BLOCK_SIZE, processes: int = None):
+    """
+    依序產生檔案中每個 M-bit 區塊的線性複雜度（不足 M bits 的尾端捨棄）。
+    每 BLOCKS_PER_TASK 個區塊為一個工作單位，結果依區塊順序串流回傳。
+    """
+    N = os.path.getsize(path) * 8 // M
+    tasks = [(i, min(i + BLOCKS_PER_TASK, N)) for i in range(0, N, BLOCKS_PER_TASK)]
+    processes = processes or os.cpu_count() or 1
+    with ProcessPoolExecutor(processes, initializer=_init_worker, initargs=(path, M)) as pool:
+        for complexities in pool.map(_block_range, tasks):
+            yield from complexities
+
+
+def _category(T: float) -> int:
+    for i, bound in enumerate((-2.5, -1.5, -0.5, 0.5, 1.5, 2.5)):
+        if T <= bound:
+            return i
+    return 6
+
+
+def linear_complexity_test(path: str, M: int = BLOCK_SIZE, processes: int = None) -> dict:
+    """
+    對位元檔執行線性複雜度測試，回傳
+    {'n', 'M', 'N', 'counts', 'chi2', 'p_value'}；p_value ≥ 0.01 視為通過。
+    """
+    # 2.0 ** -M 在 M 很大時直接下溢為 0（2 ** M 轉 float 會 OverflowError）
+    mu = M / 2 + (9 + (-1) ** (M + 1)) / 36 - (M / 3 + 2 / 9) * 2.0 ** -M
+    sign = -1 if M % 2 else 1
+    counts = [0] * 7
+    N = 0
+    for L in block_complexities(path, M, processes):
+        counts[_category(sign * (L - mu) + 2 / 9)] += 1
+        N += 1
+    if N == 0:
+        raise ValueError(f"{path} holds fewer than M = {M} bits")
+    chi2 = sum((v - N * p) ** 2 / (N * p) for v, p in zip(counts, PI))
+    # K = 6 自由度：p = igamc(3, χ²/2) = e^{-x}(1 + x + x²/2)
+    x = chi2 / 2
+    p_value = math.exp(-x) * (1 + x + x * x / 2)
+    return {'n': os.path.getsize(path) * 8, 'M': M, 'N': N,
+            'counts': counts, 'chi2': chi2, 'p_value': p_value}
+
+
+def _shake_keystream_file(path: str, nbits: int = 1_000_000):
+    """以 Lab3/problem1 的方式（SHAKE128(password || nonce)）產生金鑰流位元檔。"""
+    import hashlib
+    shake = hashlib.shake_128('password'.encode('utf-8') + os.urandom(16))
+    with open(path, 'wb') as f:
+        f.write(shake.digest(nbits // 8))
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        path = sys.argv[1]
+        block_sizes = [int(sys.argv[2]) if len(sys.argv) > 2 else BLOCK_SIZE]
+    else:
+        path = os.path.join(tempfile.gettempdir(), 'shake_keystream.bin')
+        _shake_keystream_file(path)
+        block_sizes = [BLOCK_SIZE, 2000]
+    for M in block_sizes:
+        r = linear_complexity_test(path, M)
+        print(f"n = {r['n']}, M = {r['M']}, N = {r['N']}")
+        print(f"v = {r['counts']}")
+        print(f"χ² = {r['chi2']:.6f}, p-value = {r['p_value']:.6f}",
+              "(PASS)" if r['p_value'] >= 0.01 else "(FAIL)")
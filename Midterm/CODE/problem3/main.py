@@ -4,81 +4,170 @@ Problem 3: Berlekamp–Massey vs EEA on a Very Short Sequence
 此程式同時實作：
   (1) Berlekamp–Massey 演算法，求解 minimal polynomial C_BM(x)；
   (2) Extended Euclidean Algorithm，求解 minimal polynomial C_EEA(x)。
+另提供以整數位元運算的 berlekamp_massey_int 與線上版 OnlineBM，
+可處理百萬位元等級的長序列並回報線性複雜度剖面。
+多項式運算使用 ../gf2poly.py 的 GF2Poly；原本的 sympy 版本保留為
+berlekamp_massey_sympy / eea_minpoly_sympy，以 `python main.py --check` 交叉驗證。
 
 輸入序列：
     s = (0,0,1,1,0,1,0,1,1)
 """
 
-from sympy import symbols, Poly, GF
+import os
+import sys
 
-def berlekamp_massey(s):
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from gf2poly import GF2Poly
+
+def _pack_msb_first(s) -> int:
+    """將位元序列打包成整數，s[0] 為最高位（MSB-first）"""
+    return int(''.join('1' if b else '0' for b in s) or '0', 2)
+
+def berlekamp_massey_int(s):
     """
+    以 Python 整數實作的 Berlekamp–Massey。
     輸入：
-      s -- 二進位序列 list[int]
+      s -- 二進位序列（list[int] 或任何 0/1 可迭代物件）
     回傳：
-      monic 的 Sympy Poly 物件，為 minimal polynomial over GF(2)
+      (C, L)：C 為連接多項式，第 i 個 bit 為 x^i 的係數；L 為線性複雜度
+    C、B 皆為整數：序列以 MSB-first 打包後右移 (n-1-N) 位，
+    即得第 i 個 bit 為 s[N-i] 的視窗，discrepancy 為 popcount(C & 視窗) 的奇偶，
+    更新 C ← C ⊕ (B << (N-m)) 只需一次位移與 XOR。
+    """
+    s = list(s)
+    return berlekamp_massey_packed(_pack_msb_first(s), len(s))
+
+def berlekamp_massey_packed(seq: int, n: int):
     """
-    n = len(s)
-    C = [1] + [0]*n
-    B = [1] + [0]*n
+    berlekamp_massey_int 的核心：序列已以 MSB-first 打包成 n bits 的整數 seq
+    （例如檔案中一段 bytes 的 int.from_bytes(..., 'big')），回傳 (C, L)。
+    """
+    C = B = 1
     L = 0
     m = -1
     for N in range(n):
-        # 計算 discrepancy d
-        d = s[N]
-        for i in range(1, L+1):
-            d ^= (C[i] & s[N-i])
-        if d == 1:
-            T = C.copy()
-            # C(x) ← C(x) − x^(N−m)·B(x)
-            for j in range(0, n - N + m):
-                C[N-m+j] ^= B[j]
+        if (C & (seq >> (n - 1 - N))).bit_count() & 1:
+            T = C
+            C ^= B << (N - m)
             if 2*L <= N:
                 L, B, m = N+1-L, T, N
-    # 組成 monic Poly
-    x = symbols('x')
-    poly = Poly(sum(c*x**i for i,c in enumerate(C[:L+1])), x, domain=GF(2))
-    return poly.set_modulus(2).monic()
+    return C, L
+
+class OnlineBM:
+    """
+    線上 Berlekamp–Massey：逐位元輸入序列，每一步都可讀出目前的線性複雜度，
+    依序收集即為線性複雜度剖面 (linear complexity profile)。
+    C、B 與視窗 window（第 i 個 bit 為 s[N-i]）皆以整數保存。
+    """
+    __slots__ = ('C', 'B', 'L', 'm', 'n', 'window')
+
+    def __init__(self):
+        self.C = 1
+        self.B = 1
+        self.L = 0
+        self.m = -1
+        self.n = 0
+        self.window = 0
+
+    def push(self, bit: int) -> int:
+        """輸入下一個位元，回傳目前的線性複雜度 L"""
+        N = self.n
+        self.window = (self.window << 1) | (bit & 1)
+        if (self.C & self.window).bit_count() & 1:
+            T = self.C
+            self.C ^= self.B << (N - self.m)
+            if 2*self.L <= N:
+                self.L, self.B, self.m = N+1-self.L, T, N
+        self.n = N + 1
+        return self.L
+
+    def profile(self, bits):
+        """依序輸入 bits，逐位元產生線性複雜度（剖面）"""
+        for bit in bits:
+            yield self.push(bit)
+
+def berlekamp_massey(s):
+    """
+    輸入：
+      s -- 二進位序列 list[int]
+    回傳：
+      monic 的 GF2Poly，為 minimal polynomial over GF(2)
+    （運算由 berlekamp_massey_int 完成）
+    """
+    C, L = berlekamp_massey_int(s)
+    return GF2Poly(C).monic()
 
 def eea_minpoly(s):
     """
     輸入：
       s -- 二進位序列 list[int]
     回傳：
-      monic 的 Sympy Poly 物件，為 minimal polynomial over GF(2)
+      monic 的 GF2Poly，為 minimal polynomial over GF(2)
     實作說明：
       1. 以 berlekamp_massey 求得線性複雜度 L；
       2. 設 A(x)=x^(2L)，S(x)=sum s_i x^i；
       3. 手動執行 EEA，當下一階 remainder deg < L 時中斷；
       4. 當前 v 對應 minimal polynomial，最後做 monic 正規化。
     """
-    x = symbols('x')
     # (1) 求 L
     Cbm = berlekamp_massey(s)
-    L   = Cbm.degree()
+    L   = Cbm.degree
     # (2) 建構多項式
+    S = GF2Poly.from_bits(s)
+    A = GF2Poly.x(2*L)
+    # (3) 初始 EEA 變數
+    r0, r1 = A, S
+    u0, u1 = GF2Poly(1), GF2Poly(0)
+    v0, v1 = GF2Poly(0), GF2Poly(1)
+    # 執行至 deg(r1) < L 時停止
+    while r1.degree >= L:
+        q, r2 = divmod(r0, r1)  # 商與餘式
+        u2 = u0 - q * u1
+        v2 = v0 - q * v1
+        # 更新
+        r0, r1 = r1, r2
+        u0, u1 = u1, u2
+        v0, v1 = v1, v2
+    # (4) 取 v1 並正規化為 monic
+    return v1.monic()
+
+def berlekamp_massey_sympy(s):
+    """berlekamp_massey 的 Sympy Poly 版本（僅供交叉驗證，延遲載入 sympy）"""
+    from sympy import symbols, Poly, GF
+    C, L = berlekamp_massey_int(s)
+    # 組成 monic Poly
+    x = symbols('x')
+    poly = Poly(sum(x**i for i in range(L+1) if (C >> i) & 1), x, domain=GF(2))
+    return poly.set_modulus(2).monic()
+
+def eea_minpoly_sympy(s):
+    """eea_minpoly 的 Sympy Poly 版本（僅供交叉驗證，延遲載入 sympy）"""
+    from sympy import symbols, Poly, GF
+    x = symbols('x')
+    Cbm = berlekamp_massey_sympy(s)
+    L   = Cbm.degree()
     S = Poly(sum(bit * x**i for i,bit in enumerate(s)), x, domain=GF(2)).set_modulus(2)
     A = Poly(x**(2*L), x, domain=GF(2)).set_modulus(2)
-    # (3) 初始 EEA 變數
     r0, r1 = A, S
     u0, u1 = Poly(1, x, domain=GF(2)), Poly(0, x, domain=GF(2))
     v0, v1 = Poly(0, x, domain=GF(2)), Poly(1, x, domain=GF(2))
-    # 執行至 deg(r1) < L 時停止
     while r1.degree() >= L:
-        q  = r0.quo(r1)      # 商
-        r2 = r0.rem(r1)      # 餘式
+        q  = r0.quo(r1)
+        r2 = r0.rem(r1)
         u2 = u0 - q * u1
         v2 = v0 - q * v1
-        # 更新
         r0, r1 = r1, r2
         u0, u1 = u1, u2
         v0, v1 = v1, v2
-    # (4) 取 v1 並正規化為 monic
     return v1.set_modulus(2).monic()
 
 if __name__ == '__main__':
     seq = [0,0,1,1,0,1,0,1,1]
     Cbm = berlekamp_massey(seq)
     Cee = eea_minpoly(seq)
-    print("【BM minimal polynomial】", Cbm.as_expr())
-    print("【EEA minimal polynomial】", Cee.as_expr())
+    print("【BM minimal polynomial】", Cbm)
+    print("【EEA minimal polynomial】", Cee)
+    if '--check' in sys.argv[1:]:
+        assert str(berlekamp_massey_sympy(seq).as_expr()) == str(Cbm)
+        assert str(eea_minpoly_sympy(seq).as_expr()) == str(Cee)
+        print("與 sympy 版本結果一致")
@@ -1,8 +1,10 @@
+from analysis import report
+
 # 定義 AES 使用的不可約多項式 p(x) = x^8 + x^4 + x^3 + x + 1
 # 我們用來做有限域 GF(2^8) 上的乘法與反元素運算
 MOD_P = 0x12B
 
-def gf_mul(a: int, b: int) -> int:
+def gf_mul(a: int, b: int, modulus: int = MOD_P) -> int:
     """
     在 GF(2^8) 中計算 a * b，模 p(x) 做約簡
     """
@@ -10,10 +12,10 @@ def gf_mul(a: int, b: int) -> int:
     for i in range(8):
         if (b >> i) & 1:
             r ^= a << i
-    # 模多項式的約簡：最高可能到 15 次項，需對 MOD_P 左移後消除
+    # 模多項式的約簡：最高可能到 15 次項，需對 modulus 左移後消除
     for deg in range(15, 7, -1):
         if (r >> deg) & 1:
-            r ^= MOD_P << (deg - 8)
+            r ^= modulus << (deg - 8)
     return r & 0xFF  # 回傳 8-bit 結果
 
 def gf_inv(a: int) -> int:
@@ -27,26 +29,98 @@ def gf_inv(a: int) -> int:
             return b
     raise ValueError(f"No inverse for {a}")
 
+def _poly_mod(a: int, b: int) -> int:
+    """GF(2)[x] 上 a mod b（以整數位元表示多項式）"""
+    db = b.bit_length()
+    while a.bit_length() >= db:
+        a ^= b << (a.bit_length() - db)
+    return a
+
+def is_irreducible(modulus: int) -> bool:
+    """8 次多項式不可約 ⇔ 沒有 1～4 次的因式，逐一試除即可"""
+    if modulus >> 8 != 1:
+        return False
+    return all(_poly_mod(modulus, d) for d in range(2, 32))
+
+class GF256:
+    """
+    以 modulus 定義的 GF(2^8)。建構時找出生成元並一次建好
+    exp/log 與反元素表，之後乘法與求反元素都只是查表。
+    以 GF256.get(modulus) 取得時，每個 modulus 只建一次。
+    """
+    __slots__ = ('modulus', 'generator', 'exp', 'log', 'inv')
+    _cache = {}
+
+    def __init__(self, modulus: int):
+        self.modulus = modulus
+        if not is_irreducible(modulus):
+            raise ValueError(f"0x{modulus:X} is not an irreducible degree-8 polynomial")
+        for g in range(2, 256):
+            exp = [1]
+            for _ in range(254):
+                exp.append(gf_mul(exp[-1], g, modulus))
+                if exp[-1] == 1:
+                    break
+            # g 的階恰為 255：255 個非零元素皆可逆，模數不可約且 g 為生成元
+            if len(exp) == 255 and exp[-1] != 1 and gf_mul(exp[-1], g, modulus) == 1:
+                break
+        else:
+            raise ValueError(f"0x{modulus:X} is not an irreducible degree-8 polynomial")
+        self.generator = g
+        self.exp = exp + exp  # 長度 510，log[a] + log[b] 不必再取模
+        self.log = [0] * 256
+        for i, v in enumerate(exp):
+            self.log[v] = i
+        self.inv = [0] + [self.exp[255 - self.log[x]] for x in range(1, 256)]
+
+    @classmethod
+    def get(cls, modulus: int = MOD_P) -> "GF256":
+        field = cls._cache.get(modulus)
+        if field is None:
+            field = cls._cache[modulus] = cls(modulus)
+        return field
+
+    def mul(self, a: int, b: int) -> int:
+        if a == 0 or b == 0:
+            return 0
+        return self.exp[self.log[a] + self.log[b]]
+
 # 定義 affine transform 所用循環矩陣（由 vector 11110000 生成）
 _V = [1,0,0,0,1,1,1,1]
 M = [[ _V[(j - i) % 8] for j in range(8)] for i in range(8)]
 
-def build_sbox(C: int) -> list[int]:
+def _rotr8(x: int, d: int) -> int:
+    return ((x >> d) | (x << (8 - d))) & 0xFF
+
+def affine(x: int, V=_V) -> int:
+    """
+    循環矩陣 M[i][j] = V[(j - i) % 8] 乘上 x：
+    第 i 位為 XOR_d V[d]·x_{i+d}，即所有 V[d] = 1 的 x 右旋 d 位之 XOR，整個 byte 一次計算。
+    """
+    y = 0
+    for d, bit in enumerate(V):
+        if bit:
+            y ^= _rotr8(x, d)
+    return y
+
+_affine_inv_cache = {}
+
+def _affine_of_inverses(modulus: int, V) -> list[int]:
+    """M ⋅ x^{-1}（不含常數 C）的 256 項表，依 (modulus, V) 快取。"""
+    key = (modulus, tuple(V))
+    table = _affine_inv_cache.get(key)
+    if table is None:
+        inv = GF256.get(modulus).inv
+        table = _affine_inv_cache[key] = [affine(inv[x], V) for x in range(256)]
+    return table
+
+def build_sbox(C: int, modulus: int = MOD_P, V=_V) -> list[int]:
     """
     建構 S-Box：S(x) = M ⋅ x^{-1} ⊕ C
     C：Affine constant
+    M ⋅ x^{-1} 與 C 無關，只算一次，掃過所有 C 只需逐項 XOR。
     """
-    sbox = [0]*256
-    for x in range(256):
-        inv = gf_inv(x)
-        y = 0
-        for i in range(8):  # 計算 affine transform
-            bit = 0
-            for j in range(8):
-                bit ^= ((inv >> j) & 1) & M[i][j]
-            y |= ((bit ^ ((C >> i) & 1)) << i)
-        sbox[x] = y
-    return sbox
+    return [y ^ C for y in _affine_of_inverses(modulus, V)]
 
 def is_bijective(s: list[int]) -> bool:
     """
@@ -60,27 +134,8 @@ def count_fixed_points(s: list[int]) -> int:
     """
     return sum(1 for x in range(256) if s[x] == x)
 
-# 嘗試所有 affine 常數 C，找出符合條件（雙射、無固定點）的 C 值
-candidates = []
-for C in range(256):
-    s = build_sbox(C)
-    if is_bijective(s) and count_fixed_points(s) == 0:
-        candidates.append(C)
-
-if not candidates:
-    print("未找到符合條件的 affine constant C")
-    exit(1)
-
-# 取出第一個合法 C，建立對應 S-Box
-C0 = candidates[0]
-SBOX = build_sbox(C0)
-
 # S-Box 安全性評估七項指標
 
-# 1. Bijectivity: 所有輸出值應為唯一
-bij_count = len(set(SBOX))
-
-# 2. Non-linearity: 所有非零掩碼對應的非線性度最小值（越高越好）
 def walsh_hadamard(f):
     """
     執行 Fast Walsh-Hadamard Transform，用來計算線性近似偏差
@@ -94,22 +149,26 @@ def walsh_hadamard(f):
                 W[j ^ step], W[j] = u+v, u-v
     return W
 
-min_nl = 256
-for u in range(1,256):
-    f = [bin(SBOX[x] & u).count("1") & 1 for x in range(256)]
-    g = [1 - 2 * v for v in f]  # 將 {0,1} 映射到 {+1, -1}
-    W = walsh_hadamard(g)
-    maxW = max(abs(w) for w in W)
-    nl = 128 - maxW / 2
-    min_nl = min(min_nl, nl)
+# 2. Non-linearity: 所有非零掩碼對應的非線性度最小值（越高越好）
+def nonlinearity(s):
+    min_nl = 256
+    for u in range(1,256):
+        f = [bin(s[x] & u).count("1") & 1 for x in range(256)]
+        g = [1 - 2 * v for v in f]  # 將 {0,1} 映射到 {+1, -1}
+        W = walsh_hadamard(g)
+        maxW = max(abs(w) for w in W)
+        nl = 128 - maxW / 2
+        min_nl = min(min_nl, nl)
+    return min_nl
 
 # 3. SAC (Strict Avalanche Criterion)
-total_flips = sum(
-    bin(SBOX[x] ^ SBOX[x ^ (1<<i)]).count("1")
-    for i in range(8) for x in range(256)
-)
-avg_flips_per_bit = total_flips / (256 * 8)
-sac_percent = avg_flips_per_bit / 8 * 100  # SAC 百分比
+def sac_percent(s):
+    total_flips = sum(
+        bin(s[x] ^ s[x ^ (1<<i)]).count("1")
+        for i in range(8) for x in range(256)
+    )
+    avg_flips_per_bit = total_flips / (256 * 8)
+    return avg_flips_per_bit / 8 * 100  # SAC 百分比
 
 # 4. Differential Uniformity (DU): 對所有 dx ≠ 0，dy 出現頻率的最大值（愈小愈好）
 def differential_uniformity(s):
@@ -122,17 +181,16 @@ def differential_uniformity(s):
         maxdu = max(maxdu, max(cnt.values()))
     return maxdu
 
-du = differential_uniformity(SBOX)
-
 # 5. Linear Approximation Bias (LAB): 最大偏差（愈小愈好）
-max_corr = 0
-for a in range(1,256):
-    h = [1 if bin(a & x).count("1")%2==0 else -1 for x in range(256)]
-    for u in range(1,256):
-        g = [1 if bin(u & SBOX[x]).count("1")%2==0 else -1 for x in range(256)]
-        corr = sum(h[i]*g[i] for i in range(256))
-        max_corr = max(max_corr, abs(corr))
-bias = max_corr // 2
+def linear_approx_bias(s):
+    max_corr = 0
+    for a in range(1,256):
+        h = [1 if bin(a & x).count("1")%2==0 else -1 for x in range(256)]
+        for u in range(1,256):
+            g = [1 if bin(u & s[x]).count("1")%2==0 else -1 for x in range(256)]
+            corr = sum(h[i]*g[i] for i in range(256))
+            max_corr = max(max_corr, abs(corr))
+    return max_corr // 2
 
 # 6. Algebraic Degree: 最大布爾輸出函數的代數次數（理想為 7）
 def algebraic_degree(truth):
@@ -143,22 +201,51 @@ def algebraic_degree(truth):
                 coef[m] ^= coef[m ^ (1<<i)]
     return max(bin(m).count("1") for m,v in enumerate(coef) if v)
 
-max_deg = 0
-for bit in range(8):
-    fb = [(SBOX[x]>>bit)&1 for x in range(256)]
-    max_deg = max(max_deg, algebraic_degree(fb))
-
-# 7. Fixed Points
-fixed = count_fixed_points(SBOX)
-
-# 結果輸出表格
-
-print(f"# | Criterion                | Target              | Result")
-print(f"--|--------------------------|---------------------|-------------------------")
-print(f" 1| Bijectivity              | 256 unique values   | {bij_count} unique")
-print(f" 2| Non-linearity            | ≥112                | {min_nl:.0f}")
-print(f" 3| Strict Avalanche (SAC)   | ~50% bit flips      | {sac_percent:.1f}%")
-print(f" 4| Differential Uniformity  | ≤4                  | {du}")
-print(f" 5| Linear-approx. bias      | ≤16                 | {bias}")
-print(f" 6| Algebraic degree         | 7                   | {max_deg}")
-print(f" 7| Fixed-point count        | 0                   | {fixed}")
+def max_algebraic_degree(s):
+    max_deg = 0
+    for bit in range(8):
+        fb = [(s[x]>>bit)&1 for x in range(256)]
+        max_deg = max(max_deg, algebraic_degree(fb))
+    return max_deg
+
+def main():
+    # 嘗試所有 affine 常數 C，找出符合條件（雙射、無固定點）的 C 值
+    candidates = []
+    for C in range(256):
+        s = build_sbox(C)
+        if is_bijective(s) and count_fixed_points(s) == 0:
+            candidates.append(C)
+
+    if not candidates:
+        print("未找到符合條件的 affine constant C")
+        exit(1)
+
+    # 取出第一個合法 C，建立對應 S-Box
+    C0 = candidates[0]
+    SBOX = build_sbox(C0)
+
+    # 七項指標由 analysis.report 一次算出（共用完整 DDT / LAT）；
+    # 上面的純 Python 版本保留作為對照
+    r = report(SBOX)
+    bij_count = r['bijective']
+    min_nl = r['nonlinearity']
+    sac = r['sac']
+    du = r['differential_uniformity']
+    bias = r['linear_approx_bias']
+    max_deg = r['algebraic_degree']
+    fixed = r['fixed_points']
+
+    # 結果輸出表格
+
+    print(f"# | Criterion                | Target              | Result")
+    print(f"--|--------------------------|---------------------|-------------------------")
+    print(f" 1| Bijectivity              | 256 unique values   | {bij_count} unique")
+    print(f" 2| Non-linearity            | ≥112                | {min_nl:.0f}")
+    print(f" 3| Strict Avalanche (SAC)   | ~50% bit flips      | {sac:.1f}%")
+    print(f" 4| Differential Uniformity  | ≤4                  | {du}")
+    print(f" 5| Linear-approx. bias      | ≤16                 | {bias}")
+    print(f" 6| Algebraic degree         | 7                   | {max_deg}")
+    print(f" 7| Fixed-point count        | 0                   | {fixed}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+# S-Box 設計空間搜尋：
+#   所有 30 個 8 次不可約多項式 × 所有可逆循環矩陣生成向量 V × 256 個 affine 常數 C
+# 以 (modulus, V) 為一個工作單位分散到多個行程；每個單位內先做便宜的檢查
+# （雙射、固定點、提前中止的 DU），通過者才計算 LAT 等昂貴指標。
+# 已評估的候選寫入 sqlite3 結果快取，中斷或重複搜尋時跳過已完成的單位。
+import os
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from analysis import algebraic_degree, lat, linear_approx_bias, nonlinearity, sac_percent
+from main import _affine_of_inverses, is_irreducible
+
+DB_PATH = "sbox_search.db"
+DU_BLOCK = 32  # 提前中止 DU：每次計算 32 個 dx 的 DDT 列
+
+# 七項指標門檻（同 main.py 的結果表）
+MIN_NONLINEARITY = 112
+MAX_DU = 4
+MAX_LAB = 16
+DEGREE = 7
+SAC_TOLERANCE = 1.0  # |SAC - 50%| 容許值（百分點）
+
+_X = np.arange(256)
+_C = np.arange(256)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS candidates (
+    modulus INTEGER NOT NULL,
+    v INTEGER NOT NULL,
+    c INTEGER NOT NULL,
+    bijective INTEGER NOT NULL,
+    fixed_points INTEGER NOT NULL,
+    du INTEGER,
+    sac REAL,
+    nonlinearity INTEGER,
+    lab INTEGER,
+    degree INTEGER,
+    passed INTEGER NOT NULL,
+    PRIMARY KEY (modulus, v, c)
+)
+"""
+
+
+def irreducible_moduli() -> list[int]:
+    """所有 8 次不可約多項式（x^8 項必為 1），共 30 個。"""
+    return [m for m in range(0x100, 0x200) if is_irreducible(m)]
+
+
+def circulant_generators() -> list[int]:
+    """
+    可逆循環矩陣的生成向量（以 int 表示，第 d 位為 V[d]）。
+    GF(2) 上的循環矩陣可逆 ⇔ v(x) 與 x^8 + 1 = (x + 1)^8 互質 ⇔ 權重為奇數，共 128 個。
+    """
+    return [v for v in range(256) if bin(v).count("1") & 1]
+
+
+def _bits(v: int) -> list[int]:
+    return [(v >> d) & 1 for d in range(8)]
+
+
+def _ddt_bounded(s: np.ndarray, limit: int):
+    """
+    逐區塊計算 DDT，一旦某列最大值超過 limit 立即中止。
+    回傳 (du, DDT)；中止時 DDT 為 None，du 為當下觀察到的下界。
+    """
+    blocks = []
+    for start in range(0, 256, DU_BLOCK):
+        dx = _X[start:start + DU_BLOCK]
+        dy = s[None, :] ^ s[dx[:, None] ^ _X[None, :]]
+        idx = ((dx[:, None] - start) << 8) | dy
+        block = np.bincount(idx.ravel(), minlength=len(dx) << 8).reshape(len(dx), 256)
+        du = int(block[1:].max()) if start == 0 else int(block.max())
+        if du > limit:
+            return du, None
+        blocks.append(block)
+    D = np.concatenate(blocks)
+    return int(D[1:].max()), D
+
+
+def evaluate_design(modulus: int, v: int) -> list[tuple]:
+    """
+    評估 (modulus, V) 下全部 256 個 C，回傳資料表列。
+    S_C(x) = S_0(x) ⊕ C，因此差分與 |LAT| 與 C 無關：
+    DDT / LAT 每個單位只算一次，逐 C 不同的只有固定點。
+    未計算（被剪枝）的指標記為 None。
+    """
+    s0 = np.array(_affine_of_inverses(modulus, _bits(v)), dtype=np.int64)
+    bijective = len(np.unique(s0))
+    fixed = ((s0[None, :] ^ _C[:, None]) == _X[None, :]).sum(axis=1)
+
+    survivors = set() if bijective != 256 else {c for c in range(256) if fixed[c] == 0}
+    du = sac = nl = lab = degree = None
+    ok = False
+    if survivors:
+        du, D = _ddt_bounded(s0, MAX_DU)
+        if D is not None:
+            sac = sac_percent(D)
+            if abs(sac - 50) <= SAC_TOLERANCE:
+                L = lat(s0)
+                nl = nonlinearity(L)
+                lab = linear_approx_bias(L)
+                degree = algebraic_degree(s0)
+                ok = nl >= MIN_NONLINEARITY and lab <= MAX_LAB and degree == DEGREE
+
+    rows = []
+    for c in range(256):
+        if c in survivors:
+            rows.append((modulus, v, c, bijective, int(fixed[c]), du, sac, nl, lab, degree, int(ok)))
+        else:
+            rows.append((modulus, v, c, bijective, int(fixed[c]), None, None, None, None, None, 0))
+    return rows
+
+
+def _evaluate_task(task):
+    return evaluate_design(*task)
+
+
+def _open_cache(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path)
+    conn.execute(_SCHEMA)
+    return conn
+
+
+def search(db_path: str = DB_PATH, processes: int = None, moduli=None, generators=None) -> list[tuple]:
+    """
+    搜尋 moduli × generators × 256 個 C（預設為全部），回傳通過七項指標的
+    (modulus, v, c) 清單（含先前搜尋已快取者）。
+    每完成一個 (modulus, V) 單位就寫入並 commit 至 db_path，
+    已有完整 256 列的單位不會重新計算。
+    """
+    moduli = irreducible_moduli() if moduli is None else list(moduli)
+    generators = circulant_generators() if generators is None else list(generators)
+    conn = _open_cache(db_path)
+    try:
+        done = set(conn.execute(
+            "SELECT modulus, v FROM candidates GROUP BY modulus, v HAVING COUNT(*) = 256"))
+        tasks = [(m, v) for m in moduli for v in generators if (m, v) not in done]
+        if tasks:
+            processes = processes or os.cpu_count() or 1
+            with ProcessPoolExecutor(processes) as pool:
+                for future in as_completed([pool.submit(_evaluate_task, t) for t in tasks]):
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO candidates VALUES (?,?,?,?,?,?,?,?,?,?,?)",
+                        future.result())
+                    conn.commit()
+        wanted = {(m, v) for m in moduli for v in generators}
+        return [row for row in conn.execute(
+                    "SELECT modulus, v, c FROM candidates WHERE passed = 1 ORDER BY modulus, v, c")
+                if (row[0], row[1]) in wanted]
+    finally:
+        conn.close()
+
+
+def main():
+    moduli = irreducible_moduli()
+    generators = circulant_generators()
+    passed = search()
+    total = len(moduli) * len(generators) * 256
+    print(f"{len(moduli)} moduli × {len(generators)} generators × 256 constants = {total} candidates")
+    print(f"{len(passed)} candidates meet all seven criteria")
+    for m in moduli:
+        n = sum(1 for row in passed if row[0] == m)
+        print(f"  modulus 0x{m:03X}: {n}")
+
+
+if __name__ == "__main__":
+    main()
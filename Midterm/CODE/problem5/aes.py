@@ -0,0 +1,171 @@
+# ========= T-table AES-128（ECB / CTR 大量加密）=========
+# 四張 32-bit T-table 由 build_mul_tables 與 S-box 推得；狀態以 (N, 4) uint32 陣列表示，
+# 第 c 欄為一個 little-endian word（byte r 位於第 8r bit，同 main.py 的 col_word）。
+# T-table 以資料值為索引查表，不是常數時間；encrypt_ecb_ct 與 bitslice.encrypt_blocks
+# 為常數時間版本，benchmark() 量測三者的 MB/s 差距。
+import os
+import time
+from functools import lru_cache
+
+import numpy as np
+
+from bitslice import encrypt_blocks as bitslice_encrypt_blocks
+from bitslice import expand_key, pack_blocks, sub_bytes, unpack_blocks
+from main import build_mul_tables, ct_lookup_many, mixcol_ct_many
+
+ROUNDS = 10
+KEY_CACHE_SIZE = 64
+BATCH_BLOCKS = 1 << 14  # 每批處理的區塊數，限制暫存陣列大小
+# ShiftRows：輸出 byte 4c + r 取自輸入 byte 4((c + r) % 4) + r
+_SHIFT_ROWS = np.array([4 * ((i // 4 + i % 4) % 4) + i % 4 for i in range(16)])
+
+
+def _rotl8(t: np.ndarray) -> np.ndarray:
+    return (t << np.uint32(8)) | (t >> np.uint32(24))
+
+
+def _build_tables():
+    """S-box 以位切電路一次算出 256 項；T0[x] 為 S(x) 在第 0 列時對整欄的貢獻 (2s, s, s, 3s)。"""
+    sbox = np.frombuffer(
+        unpack_blocks(sub_bytes(pack_blocks(bytes(range(256))), (1 << 256) - 1), 16), dtype=np.uint8)
+    mul2, mul3 = build_mul_tables()
+    s = sbox.astype(np.uint32)
+    s2 = np.array(mul2, dtype=np.uint32)[sbox]
+    s3 = np.array(mul3, dtype=np.uint32)[sbox]
+    t0 = s2 | (s << 8) | (s << 16) | (s3 << 24)
+    t1 = _rotl8(t0)
+    t2 = _rotl8(t1)
+    t3 = _rotl8(t2)
+    return sbox, (t0, t1, t2, t3)
+
+
+SBOX, (T0, T1, T2, T3) = _build_tables()
+_SBOX32 = SBOX.astype(np.uint32)
+
+
+@lru_cache(maxsize=KEY_CACHE_SIZE)
+def key_schedule(key: bytes) -> np.ndarray:
+    """展開後的 11 把輪金鑰，(11, 4) uint32（little-endian 欄 word），依金鑰做 LRU 快取。"""
+    rks = np.frombuffer(b''.join(expand_key(bytes(key))), dtype='<u4').reshape(ROUNDS + 1, 4)
+    rks = rks.astype(np.uint32)
+    rks.flags.writeable = False
+    return rks
+
+
+def _encrypt_words(w: np.ndarray, rks: np.ndarray) -> np.ndarray:
+    """對 (N, 4) uint32 狀態做完整 AES-128 加密。"""
+    w = w ^ rks[0]
+    m = np.uint32(0xff)
+    for r in range(1, ROUNDS + 1):
+        b0 = w & m
+        b1 = (w >> np.uint32(8)) & m
+        b2 = (w >> np.uint32(16)) & m
+        b3 = w >> np.uint32(24)
+        # 欄 c 的第 r 列在 ShiftRows 後來自欄 c + r
+        b1 = np.roll(b1, -1, axis=1)
+        b2 = np.roll(b2, -2, axis=1)
+        b3 = np.roll(b3, -3, axis=1)
+        if r != ROUNDS:
+            w = T0[b0] ^ T1[b1] ^ T2[b2] ^ T3[b3]
+        else:
+            w = _SBOX32[b0] | (_SBOX32[b1] << 8) | (_SBOX32[b2] << 16) | (_SBOX32[b3] << 24)
+        w ^= rks[r]
+    return w
+
+
+def _encrypt_buffer(key: bytes, data) -> bytes:
+    rks = key_schedule(bytes(key))
+    words = np.frombuffer(data, dtype='<u4').reshape(-1, 4)
+    out = bytearray()
+    for start in range(0, len(words), BATCH_BLOCKS):
+        out += _encrypt_words(words[start:start + BATCH_BLOCKS], rks).astype('<u4').tobytes()
+    return bytes(out)
+
+
+def encrypt_ecb(key: bytes, data: bytes) -> bytes:
+    """AES-128 ECB 加密，len(data) 須為 16 的倍數；以 BATCH_BLOCKS 為單位批次處理。"""
+    if len(data) % 16:
+        raise ValueError("data length must be a multiple of 16")
+    return _encrypt_buffer(key, data)
+
+
+def _counter_blocks(counter: bytes, start: int, n: int) -> bytes:
+    """第 start 到 start + n - 1 個計數區塊：16-byte big-endian 計數器逐塊加一（mod 2^128）。"""
+    hi0, lo0 = np.frombuffer(counter, dtype='>u8').astype(np.uint64)
+    lo = np.arange(n, dtype=np.uint64) + np.uint64(start)
+    lo += lo0  # 陣列運算溢位時自然 mod 2^64
+    hi = hi0 + (lo < lo0).astype(np.uint64)  # 低 64 位元溢位時進位
+    return np.stack([hi, lo], axis=1).astype('>u8').tobytes()
+
+
+def encrypt_ctr(key: bytes, counter: bytes, data: bytes) -> bytes:
+    """
+    AES-128 CTR：counter 為 16-byte 初始計數區塊。加密與解密相同，data 長度不限。
+    金鑰流與 data 以大整數一次 XOR。
+    """
+    if len(counter) != 16:
+        raise ValueError("counter block must be 16 bytes")
+    out = bytearray()
+    step = 16 * BATCH_BLOCKS
+    for start in range(0, len(data), step):
+        chunk = data[start:start + step]
+        n = (len(chunk) + 15) // 16
+        stream = _encrypt_buffer(key, _counter_blocks(counter, start // 16, n))[:len(chunk)]
+        out += (int.from_bytes(chunk, 'big') ^ int.from_bytes(stream, 'big')).to_bytes(len(chunk), 'big')
+    return bytes(out)
+
+
+decrypt_ctr = encrypt_ctr
+
+
+def encrypt_ecb_ct(key: bytes, data: bytes) -> bytes:
+    """
+    常數時間 CT-LUT 版 AES-128 ECB：SubBytes 以 ct_lookup_many 掃過整張 S-box，
+    MixColumns 以 mixcol_ct_many，ShiftRows 為固定的 byte 置換。
+    """
+    if len(data) % 16:
+        raise ValueError("data length must be a multiple of 16")
+    rks = np.frombuffer(b''.join(expand_key(bytes(key))), dtype=np.uint8).reshape(ROUNDS + 1, 16)
+    mul2, mul3 = build_mul_tables()
+    s = np.frombuffer(data, dtype=np.uint8).reshape(-1, 16) ^ rks[0]
+    for r in range(1, ROUNDS + 1):
+        s = ct_lookup_many(SBOX, s)[:, _SHIFT_ROWS]
+        if r != ROUNDS:
+            s = mixcol_ct_many(s, mul2, mul3).reshape(-1, 16)
+        s = s ^ rks[r]
+    return s.astype(np.uint8).tobytes()
+
+
+def benchmark(nbytes: int = 1 << 18) -> dict:
+    """以同一把金鑰加密 nbytes 隨機資料，回傳各實作的 MB/s。"""
+    key = os.urandom(16)
+    data = os.urandom(nbytes)
+    paths = {
+        'T-table ECB': lambda: encrypt_ecb(key, data),
+        'T-table CTR': lambda: encrypt_ctr(key, bytes(16), data),
+        'CT-LUT ECB': lambda: encrypt_ecb_ct(key, data),
+        'bitsliced ECB': lambda: bitslice_encrypt_blocks(key, data),
+    }
+    rates = {}
+    for name, run in paths.items():
+        t = time.perf_counter()
+        run()
+        rates[name] = nbytes / (time.perf_counter() - t) / 1e6
+    return rates
+
+
+if __name__ == "__main__":
+    # FIPS-197 C.1 與 NIST SP 800-38A F.1.1 / F.5.1
+    assert encrypt_ecb(bytes(range(16)), bytes.fromhex("00112233445566778899aabbccddeeff")).hex() \
+        == "69c4e0d86a7b0430d8cdb78070b4c55a"
+    key = bytes.fromhex("2b7e151628aed2a6abf7158809cf4f3c")
+    pt = bytes.fromhex("6bc1bee22e409f96e93d7e117393172a")
+    assert encrypt_ecb(key, pt).hex() == "3ad77bb40d7a3660a89ecaf32466ef97"
+    ctr0 = bytes.fromhex("f0f1f2f3f4f5f6f7f8f9fafbfcfdfeff")
+    assert encrypt_ctr(key, ctr0, pt).hex() == "874d6191b620e3261bef6864990db6ce"
+    data = os.urandom(16 * 100)
+    assert encrypt_ecb(key, data) == encrypt_ecb_ct(key, data) == bitslice_encrypt_blocks(key, data)
+    print("測試向量通過；T-table、CT-LUT 與位切結果一致。")
+
+    for name, rate in benchmark().items():
+        print(f"{name:14s} {rate:8.3f} MB/s")
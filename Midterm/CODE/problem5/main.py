@@ -1,5 +1,9 @@
 import random
 
+import numpy as np
+
+CT_CHUNK = 4096  # ct_lookup_many 每次廣播處理的索引數
+
 # ========= 常數時間查表 (Constant-Time LUT) 實作 =========
 def ct_lookup(table: list[int], idx: int) -> int:
     """
@@ -13,6 +17,26 @@ def ct_lookup(table: list[int], idx: int) -> int:
         result ^= val & mask
     return result
 
+def ct_lookup_many(table, indices) -> np.ndarray:
+    """
+    批次常數時間查表：一次掃過整張表解出整個索引向量。
+    對每個索引與表中每一項都做 mask = -(i == idx)、result ^= val & mask，
+    與 ct_lookup 相同，只是以 NumPy 廣播同時處理 CT_CHUNK 個索引；
+    記憶體存取模式只取決於表長與索引個數，與索引值無關。
+    回傳與 indices 同形狀、dtype 足以容納表值的陣列。
+    """
+    tbl = np.asarray(table)
+    tbl = tbl.astype(np.min_scalar_type(int(tbl.max())))
+    idx = np.asarray(indices)
+    flat = idx.ravel()
+    entries = np.arange(len(tbl))
+    out = np.empty(flat.shape, dtype=tbl.dtype)
+    for start in range(0, len(flat), CT_CHUNK):
+        chunk = flat[start:start + CT_CHUNK]
+        mask = -(chunk[:, None] == entries[None, :]).astype(tbl.dtype)  # True -> 全 1
+        out[start:start + CT_CHUNK] = np.bitwise_xor.reduce(tbl[None, :] & mask, axis=1)
+    return out.reshape(idx.shape)
+
 def build_mul_tables():
     """
     產生 GF(2^8) 乘法查表 mul2 (x*2) 與 mul3 (x*3)
@@ -37,6 +61,25 @@ def mixcol_ct(col_bytes: list[int], mul2: list[int], mul3: list[int]) -> list[in
     y3 = ct_lookup(mul3, a0) ^ a1 ^ a2 ^ ct_lookup(mul2, a3)
     return [y0, y1, y2, y3]
 
+def mixcol_ct_many(cols, mul2: list[int], mul3: list[int]) -> np.ndarray:
+    """
+    批次常數時間 MixColumns：cols 為 (M, 4) 的 byte 陣列（或長度為 4 倍數的 bytes），
+    mul2 / mul3 各只以 ct_lookup_many 掃一次就解出全部 4M 個 byte。
+    回傳 (M, 4) uint8 陣列，每列與 mixcol_ct 的結果相同。
+    """
+    if isinstance(cols, (bytes, bytearray, memoryview)):
+        cols = np.frombuffer(cols, dtype=np.uint8)
+    a = np.asarray(cols, dtype=np.uint8).reshape(-1, 4)
+    m2 = ct_lookup_many(mul2, a)
+    m3 = ct_lookup_many(mul3, a)
+    a0, a1, a2, a3 = a.T
+    return np.stack([
+        m2[:, 0] ^ m3[:, 1] ^ a2 ^ a3,
+        a0 ^ m2[:, 1] ^ m3[:, 2] ^ a3,
+        a0 ^ a1 ^ m2[:, 2] ^ m3[:, 3],
+        m3[:, 0] ^ a1 ^ a2 ^ m2[:, 3],
+    ], axis=1).astype(np.uint8)
+
 # ========= 位切 (Bit-Sliced) 實作 =========
 def xtime32(x: int) -> int:
     """
@@ -79,4 +122,12 @@ if __name__ == "__main__":
         bs_word = mixcol_bitslice(col_word)
         assert bs_word == ct_word, f"Mismatch: CT-LUT=0x{ct_word:08x}, bitslice=0x{bs_word:08x}"
         print(f"Column {col} -> 0x{ct_word:08x} (OK)")
+
+    # 批次 CT-LUT：與逐欄 mixcol_ct 比對
+    cols = np.random.randint(0, 256, size=(1000, 4), dtype=np.uint8)
+    many = mixcol_ct_many(cols, mul2, mul3)
+    for col, res in zip(cols.tolist(), many.tolist()):
+        assert res == mixcol_ct(col, mul2, mul3), f"Mismatch: {col}"
+    assert (ct_lookup_many(mul2, np.arange(256)) == mul2).all()
+    print(f"mixcol_ct_many：{len(cols)} 欄與 mixcol_ct 結果一致")
     print("所有測試通過：CT-LUT 與 Bit-Sliced MixColumns 結果一致。")